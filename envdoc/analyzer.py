@@ -3,13 +3,34 @@ Enhanced Environment Variable Analyzer
 Analyzes scan results with system environment integration
 """
 
-from typing import Dict, List, Set, Tuple, Optional
+import heapq
+import io
+import logging
+import re
+import sys
+from typing import Dict, List, Sequence, Set, Tuple, Optional
 from dataclasses import dataclass
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from difflib import get_close_matches
+from functools import lru_cache, reduce
+from itertools import islice
+from operator import or_
+
+try:
+    from rapidfuzz import process, fuzz
+    RAPIDFUZZ_AVAILABLE = True
+except ImportError:
+    RAPIDFUZZ_AVAILABLE = False
 
 from .scanner import EnvUsage, ScanResult
 
-@dataclass
+_log = logging.getLogger(__name__)
+
+# Slotted result objects (no per-instance __dict__) where dataclasses support it
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+@dataclass(**_SLOTS)
 class EnhancedMismatch:
     """Enhanced mismatch with system environment awareness"""
     used_name: str
@@ -21,7 +42,7 @@ class EnhancedMismatch:
     file_available: List[str]  # Files where it's available
     recommended_action: str
     
-@dataclass 
+@dataclass(**_SLOTS)
 class EnhancedAnalysisResult:
     """Enhanced analysis result with system integration"""
     mismatches: List[EnhancedMismatch]
@@ -32,6 +53,95 @@ class EnhancedAnalysisResult:
     sensitive_variables: List[str]
     statistics: Dict[str, any]
 
+@dataclass
+class _VariablePool:
+    """Lookup structures over one source of defined variables, built once per analysis"""
+    names: Tuple[str, ...]
+    name_set: Set[str]
+    trigrams: Dict[str, List[int]]  # trigram -> positions in names
+    base_names: Dict[str, List[str]]  # name with a common prefix stripped -> full names
+
+def _index_suffix_swaps(patterns: Sequence[Tuple[str, str]]) -> Dict[str, List[str]]:
+    """Map every pattern suffix to the suffixes it can be swapped for, in both directions"""
+    swaps: Dict[str, List[str]] = defaultdict(list)
+    for suffix1, suffix2 in patterns:
+        swaps[suffix1].append(suffix2)
+        swaps[suffix2].append(suffix1)
+    return dict(swaps)
+
+# Separators ignored when comparing names (DB_HOST ~ db-host ~ dbhost)
+_STRIP_TABLE = str.maketrans('', '', '_-')
+
+def _norm(name: str) -> str:
+    """Normalize a variable name for formatting-insensitive comparison"""
+    return name.lower().translate(_STRIP_TABLE)
+
+# int.bit_count is a single POPCNT but only exists on Python 3.10+
+_popcount = getattr(int, 'bit_count', None) or (lambda n: bin(n).count('1'))
+
+@lru_cache(maxsize=4096)
+def _char_mask(name: str) -> int:
+    """Bitmask of the characters present in a name (one bit per code point)"""
+    return reduce(or_, (1 << ord(c) for c in name), 0)
+
+@lru_cache(maxsize=8192)
+def _normalized_similarity(s1: str, s2: str) -> float:
+    """Similarity score for two normalized variable names (pure, so memoized)"""
+    if s1 == s2:
+        return 0.95  # Very high but not perfect (different formatting)
+    
+    len_diff = abs(len(s1) - len(s2))
+    max_len = max(len(s1), len(s2))
+    
+    # Candidates reach scoring through a 0.6 fuzzy ratio on the raw names, so a
+    # length gap this wide only arises from separator-padded names; treat the
+    # pair as unrelated without scoring it
+    if max_len and len_diff / max_len > 0.7:
+        return 0.0
+    
+    # Multiple similarity metrics
+    
+    # 1. Character overlap
+    mask1, mask2 = _char_mask(s1), _char_mask(s2)
+    total_chars = _popcount(mask1 | mask2)
+    char_similarity = _popcount(mask1 & mask2) / total_chars if total_chars else 0
+    
+    # 2. Length similarity
+    len_similarity = 1.0 - (len_diff / max_len) if max_len > 0 else 1.0
+    
+    # 3. Substring similarity
+    substr_similarity = 0
+    if s1 in s2 or s2 in s1:
+        substr_similarity = 0.8
+    elif any(part in s2 for part in s1.split('_') if len(part) > 2):
+        substr_similarity = 0.6
+    
+    # 4. Prefix/suffix similarity
+    prefix_suffix_sim = 0
+    if s1.startswith(s2) or s2.startswith(s1):
+        prefix_suffix_sim = 0.7
+    elif s1.endswith(s2) or s2.endswith(s1):
+        prefix_suffix_sim = 0.6
+    
+    # Weighted combination
+    similarity = (
+        char_similarity * 0.3 +
+        len_similarity * 0.2 +
+        substr_similarity * 0.3 +
+        prefix_suffix_sim * 0.2
+    )
+    
+    return min(similarity, 0.95)  # Cap at 0.95 for non-exact matches
+
+# Fixed report text, formatted once at import instead of on every report
+_REPORT_HEADER = "🏥 EnvDoctor Enhanced Analysis Report\n" + "=" * 60
+_REPORT_SECURITY_NOTICE = "\n   Please ensure these are properly secured and not committed to version control."
+_REPORT_EXCELLENT = "\n\n🎉 Excellent! Your environment configuration is very well organized."
+_REPORT_GOOD = ("\n\n👍 Good configuration with minor issues that are easy to fix."
+                "\n💡 Consider running 'envdoctor --fix' for interactive resolution.")
+_REPORT_POOR = ("\n\n⚠️ Several configuration issues found."
+                "\n🔧 Run 'envdoctor --fix' for guided resolution, or 'envdoctor --batch-fix' for automatic fixes.")
+
 class EnhancedEnvAnalyzer:
     """
     Enhanced Environment Variable Analyzer
@@ -116,17 +226,49 @@ class EnhancedEnvAnalyzer:
         'TRACKERGENAI_', 'TRACKER_',
     ]
     
+    # Every common prefix ends with an underscore, so a name's candidate
+    # prefixes are exactly its underscore-terminated heads
+    _PREFIX_SET = frozenset(COMMON_PREFIXES)
+    
+    # NAMING_PATTERNS flattened to suffix -> replacements, probed once per
+    # distinct suffix length instead of scanning every pattern pair
+    _SUFFIX_SWAPS = _index_suffix_swaps(NAMING_PATTERNS)
+    _SUFFIX_LENGTHS = tuple(sorted(set(map(len, _SUFFIX_SWAPS))))
+    
+    # Name fragments that mark a variable as holding sensitive information
+    SENSITIVE_PATTERNS = [
+        'password', 'passwd', 'pwd', 'secret', 'key', 'token',
+        'auth', 'credential', 'private', 'cert', 'ssl', 'api_key',
+        'access_key', 'private_key', 'client_secret'
+    ]
+    _SENSITIVE_RE = re.compile('|'.join(map(re.escape, SENSITIVE_PATTERNS)), re.IGNORECASE)
+    
+    # Minimum fuzzy ratio for a variable to be considered a suggestion
+    FUZZY_CUTOFF = 0.6
+    
     def __init__(self):
         self.scan_result: Optional[ScanResult] = None
         self.used_vars: Set[str] = set()
         self.system_vars: Set[str] = set()
         self.file_vars: Set[str] = set()
+        self._usages_by_name: Dict[str, List[EnvUsage]] = {}
         
+        # Candidate pools and normalized names, built once per analysis
+        self._system_pool = self._build_pool(())
+        self._file_pool = self._build_pool(())
+        self._available_list: Tuple[str, ...] = ()
+        self._norm_map: Dict[str, str] = {}
+    
     def analyze_enhanced(self, scan_result: ScanResult) -> EnhancedAnalysisResult:
         """Perform enhanced analysis with system environment integration"""
         
         self.scan_result = scan_result
-        self.used_vars = {usage.variable_name for usage in scan_result.usages}
+        
+        # Group usages by variable name in a single pass
+        self._usages_by_name = defaultdict(list)
+        for usage in scan_result.usages:
+            self._usages_by_name[usage.variable_name].append(usage)
+        self.used_vars = set(self._usages_by_name)
         self.system_vars = set(scan_result.system_variables.keys())
         
         # Get all file-based variables
@@ -135,22 +277,33 @@ class EnhancedEnvAnalyzer:
             all_file_vars.update(file_vars.keys())
         self.file_vars = all_file_vars
         
-        print(f"🔍 Enhanced analysis: {len(self.used_vars)} used, {len(self.system_vars)} system, {len(self.file_vars)} file")
-        
-        # Find mismatches with system awareness
-        mismatches = self._find_enhanced_mismatches()
+        _log.info("🔍 Enhanced analysis: %d used, %d system, %d file",
+                  len(self.used_vars), len(self.system_vars), len(self.file_vars))
         
-        # Categorize matches
-        perfect_matches = list(self.used_vars & (self.system_vars | self.file_vars))
-        system_only_matches = list(self.used_vars & self.system_vars - self.file_vars)
-        file_only_matches = list(self.used_vars & self.file_vars - self.system_vars)
-        
-        # Find unused definitions
-        all_defined = self.system_vars | self.file_vars
-        unused_definitions = list(all_defined - self.used_vars)
+        all_available = self.system_vars | self.file_vars
         
-        # Find sensitive variables
-        sensitive_vars = self._find_sensitive_variables()
+        # The stages only read analyzer state, so mismatch finding (mostly
+        # GIL-releasing fuzzy scoring) overlaps with the cheaper stages
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            # Find mismatches with system awareness
+            mismatches_future = executor.submit(self._find_enhanced_mismatches, all_available)
+            
+            # Find sensitive variables
+            sensitive_future = executor.submit(self._find_sensitive_variables)
+            
+            # Categorize matches (walk used_vars, usually the smallest set)
+            system_vars, file_vars = self.system_vars, self.file_vars
+            perfect_matches = [var for var in self.used_vars if var in all_available]
+            system_only_matches = [var for var in perfect_matches
+                                   if var in system_vars and var not in file_vars]
+            file_only_matches = [var for var in perfect_matches
+                                 if var in file_vars and var not in system_vars]
+            
+            # Find unused definitions
+            unused_definitions = [var for var in all_available if var not in self.used_vars]
+            
+            mismatches = mismatches_future.result()
+            sensitive_vars = sensitive_future.result()
         
         # Calculate enhanced statistics
         statistics = self._calculate_enhanced_statistics(
@@ -168,64 +321,79 @@ class EnhancedEnvAnalyzer:
             statistics=statistics
         )
     
-    def _find_enhanced_mismatches(self) -> List[EnhancedMismatch]:
+    def _find_enhanced_mismatches(self, all_available: Set[str]) -> List[EnhancedMismatch]:
         """Find mismatches with enhanced system environment awareness"""
         mismatches = []
-        
-        all_available = self.system_vars | self.file_vars
-        
-        for used_var in self.used_vars:
-            if used_var not in all_available:
-                # Find potential matches from both system and files
-                system_suggestions = self._find_suggestions_in_set(used_var, self.system_vars)
-                file_suggestions = self._find_suggestions_in_set(used_var, self.file_vars)
-                
-                # Combine and rank suggestions
-                all_suggestions = self._combine_suggestions(system_suggestions, file_suggestions)
-                
-                # Determine issue type and recommended action
-                issue_type, recommended_action = self._classify_enhanced_issue(
-                    used_var, system_suggestions, file_suggestions
-                )
-                
-                # Find which files have potential matches
-                file_availability = self._find_file_availability(used_var)
-                
-                # Get all usages for this variable
-                var_usages = [usage for usage in self.scan_result.usages 
-                             if usage.variable_name == used_var]
-                
-                mismatch = EnhancedMismatch(
-                    used_name=used_var,
-                    usages=var_usages,
-                    suggested_matches=[s[0] for s in all_suggestions],
-                    confidence_scores=[s[1] for s in all_suggestions],
-                    issue_type=issue_type,
-                    system_available=len(system_suggestions) > 0,
-                    file_available=file_availability,
-                    recommended_action=recommended_action
-                )
-                mismatches.append(mismatch)
+        missing_vars = [var for var in self.used_vars if var not in all_available]
+        
+        # Healthy projects have nothing missing; skip building the lookup pools
+        if not missing_vars:
+            return mismatches
+        
+        self._system_pool = self._build_pool(tuple(self.system_vars))
+        self._file_pool = self._build_pool(tuple(self.file_vars))
+        self._available_list = self._system_pool.names + self._file_pool.names
+        self._norm_map = {var: _norm(var) for var in self._available_list}
+        self._norm_map.update((var, _norm(var)) for var in missing_vars)
+        
+        # Score all missing variables against each pool in one batch when possible
+        system_fuzzy = self._batch_close_matches(missing_vars, self._system_pool)
+        file_fuzzy = self._batch_close_matches(missing_vars, self._file_pool)
+        
+        for used_var in missing_vars:
+            # Find potential matches from both system and files
+            system_suggestions = self._find_suggestions_in_set(
+                used_var, self._system_pool, system_fuzzy.get(used_var)
+            )
+            file_suggestions = self._find_suggestions_in_set(
+                used_var, self._file_pool, file_fuzzy.get(used_var)
+            )
+            
+            # Combine and rank suggestions
+            all_suggestions = self._combine_suggestions(system_suggestions, file_suggestions)
+            
+            # Determine issue type and recommended action
+            issue_type, recommended_action = self._classify_enhanced_issue(
+                used_var, system_suggestions, file_suggestions
+            )
+            
+            # Find which files have potential matches
+            file_availability = self._find_file_availability(used_var)
+            
+            mismatch = EnhancedMismatch(
+                used_name=used_var,
+                usages=self._usages_by_name[used_var],
+                suggested_matches=[s[0] for s in all_suggestions],
+                confidence_scores=[s[1] for s in all_suggestions],
+                issue_type=issue_type,
+                system_available=len(system_suggestions) > 0,
+                file_available=file_availability,
+                recommended_action=recommended_action
+            )
+            mismatches.append(mismatch)
         
         return mismatches
     
-    def _find_suggestions_in_set(self, used_var: str, variable_set: Set[str]) -> List[Tuple[str, float]]:
-        """Find suggestions in a specific set of variables"""
+    def _find_suggestions_in_set(self, used_var: str, pool: _VariablePool,
+                                 fuzzy_matches: Optional[List[str]] = None) -> List[Tuple[str, float]]:
+        """Find suggestions in a prebuilt pool of variables"""
         suggestions = []
-        var_list = list(variable_set)
         
-        # 1. Exact fuzzy matching
-        fuzzy_matches = get_close_matches(used_var, var_list, n=5, cutoff=0.6)
+        # 1. Exact fuzzy matching, against names sharing a trigram with used_var
+        #    (skipped when the caller already batch-scored used_var)
+        if fuzzy_matches is None:
+            fuzzy_candidates = self._trigram_candidates(used_var, pool.names, pool.trigrams)
+            fuzzy_matches = self._close_matches(used_var, fuzzy_candidates, n=5, cutoff=self.FUZZY_CUTOFF)
         for match in fuzzy_matches:
             similarity = self._calculate_similarity(used_var, match)
             suggestions.append((match, similarity))
         
         # 2. Pattern-based matching
-        pattern_matches = self._find_pattern_matches(used_var, var_list)
+        pattern_matches = self._find_pattern_matches(used_var, pool.name_set)
         suggestions.extend(pattern_matches)
         
         # 3. Prefix/suffix matching
-        prefix_suffix_matches = self._find_prefix_suffix_matches(used_var, var_list)
+        prefix_suffix_matches = self._find_prefix_suffix_matches(used_var, pool)
         suggestions.extend(prefix_suffix_matches)
         
         # Remove duplicates and sort by confidence
@@ -290,123 +458,167 @@ class EnhancedEnvAnalyzer:
     def _find_file_availability(self, used_var: str) -> List[str]:
         """Find which files have variables similar to the used variable"""
         file_availability = []
+        min_len, max_len = self._length_window(used_var, 0.8)
         
         for filename, variables in self.scan_result.file_variables.items():
             # Check for exact matches or close matches in this file
             if used_var in variables:
                 file_availability.append(f"{filename} (exact)")
             else:
-                # Check for close matches
-                close_matches = get_close_matches(used_var, list(variables.keys()), n=1, cutoff=0.8)
+                # Check for close matches, among names whose length can reach the cutoff
+                candidates = [var for var in variables if min_len <= len(var) <= max_len]
+                close_matches = self._close_matches(used_var, candidates, n=1, cutoff=0.8)
                 if close_matches:
                     file_availability.append(f"{filename} (similar: {close_matches[0]})")
         
         return file_availability
     
+    def _build_pool(self, names: Tuple[str, ...]) -> _VariablePool:
+        """Precompute the lookup structures used to find suggestions among names"""
+        base_names = defaultdict(list)
+        for var in names:
+            for prefix in self._match_prefixes(var):
+                base_names[var[len(prefix):]].append(var)
+        
+        return _VariablePool(
+            names=names,
+            name_set=set(names),
+            trigrams=self._build_trigram_index(names),
+            base_names=base_names
+        )
+    
+    def _match_prefixes(self, name: str) -> List[str]:
+        """Common prefixes that name starts with, found in one pass over its underscores"""
+        prefixes = []
+        end = name.find('_')
+        while end != -1:
+            head = name[:end + 1]
+            if head in self._PREFIX_SET:
+                prefixes.append(head)
+            end = name.find('_', end + 1)
+        return prefixes
+    
+    @staticmethod
+    def _trigrams(name: str) -> Set[str]:
+        """All 3-character substrings of a variable name, padded so short names still index"""
+        padded = f"  {name} "
+        return {padded[i:i + 3] for i in range(len(padded) - 2)}
+    
+    def _build_trigram_index(self, var_list: Sequence[str]) -> Dict[str, List[int]]:
+        """Map each trigram to the positions of the variables containing it"""
+        index = defaultdict(list)
+        for position, var in enumerate(var_list):
+            for trigram in self._trigrams(var):
+                index[trigram].append(position)
+        return index
+    
+    def _trigram_candidates(self, used_var: str, var_list: Sequence[str],
+                            index: Dict[str, List[int]]) -> Sequence[str]:
+        """Variables sharing a trigram with used_var and close enough in length to match"""
+        positions = set()
+        for trigram in self._trigrams(used_var):
+            positions.update(index.get(trigram, ()))
+        
+        min_len, max_len = self._length_window(used_var, self.FUZZY_CUTOFF)
+        return [var_list[pos] for pos in sorted(positions)
+                if min_len <= len(var_list[pos]) <= max_len]
+    
+    @staticmethod
+    def _length_window(used_var: str, cutoff: float) -> Tuple[float, float]:
+        """Range of name lengths that can reach a similarity ratio >= cutoff against used_var"""
+        # ratio = 2 * matches / (len1 + len2) and matches <= the shorter length
+        return (len(used_var) * cutoff / (2 - cutoff) - 1e-9,
+                len(used_var) * (2 - cutoff) / cutoff + 1e-9)
+    
+    def _batch_close_matches(self, used_vars: List[str], pool: _VariablePool,
+                             n: int = 5) -> Dict[str, List[str]]:
+        """
+        Top fuzzy candidates for many variables at once via rapidfuzz.process.cdist,
+        which scores the whole matrix in C++ across all cores. Returns an empty dict
+        when RapidFuzz or NumPy is unavailable so callers match per variable instead.
+        """
+        if not RAPIDFUZZ_AVAILABLE or not used_vars or not pool.names:
+            return {}
+        
+        try:
+            import numpy as np
+        except ImportError:
+            return {}
+        
+        scores = process.cdist(used_vars, pool.names, scorer=fuzz.ratio,
+                               score_cutoff=self.FUZZY_CUTOFF * 100,
+                               dtype=np.float64, workers=-1)
+        
+        matches = {}
+        for used_var, row in zip(used_vars, scores):
+            # Stable sort keeps process.extract's tie order (earlier names first)
+            best = np.argsort(-row, kind='stable')[:n]
+            matches[used_var] = [pool.names[i] for i in best if row[i] > 0]
+        return matches
+    
+    def _close_matches(self, used_var: str, candidates: Sequence[str], n: int, cutoff: float) -> List[str]:
+        """Best fuzzy candidates for used_var, using RapidFuzz when installed"""
+        if RAPIDFUZZ_AVAILABLE:
+            matches = process.extract(used_var, candidates, scorer=fuzz.ratio,
+                                      limit=n, score_cutoff=cutoff * 100)
+            return [match[0] for match in matches]
+        
+        return get_close_matches(used_var, candidates, n=n, cutoff=cutoff)
+    
     def _calculate_similarity(self, str1: str, str2: str) -> float:
         """Enhanced similarity calculation"""
         if str1 == str2:
             return 1.0
         
-        # Normalize strings
-        s1 = str1.lower().replace('_', '').replace('-', '')
-        s2 = str2.lower().replace('_', '').replace('-', '')
-        
-        if s1 == s2:
-            return 0.95  # Very high but not perfect (different formatting)
-        
-        # Multiple similarity metrics
-        
-        # 1. Character overlap
-        common_chars = set(s1) & set(s2)
-        total_chars = set(s1) | set(s2)
-        char_similarity = len(common_chars) / len(total_chars) if total_chars else 0
-        
-        # 2. Length similarity
-        len_diff = abs(len(s1) - len(s2))
-        max_len = max(len(s1), len(s2))
-        len_similarity = 1.0 - (len_diff / max_len) if max_len > 0 else 1.0
-        
-        # 3. Substring similarity
-        substr_similarity = 0
-        if s1 in s2 or s2 in s1:
-            substr_similarity = 0.8
-        elif any(part in s2 for part in s1.split('_') if len(part) > 2):
-            substr_similarity = 0.6
-        
-        # 4. Prefix/suffix similarity
-        prefix_suffix_sim = 0
-        if s1.startswith(s2) or s2.startswith(s1):
-            prefix_suffix_sim = 0.7
-        elif s1.endswith(s2) or s2.endswith(s1):
-            prefix_suffix_sim = 0.6
-        
-        # Weighted combination
-        similarity = (
-            char_similarity * 0.3 +
-            len_similarity * 0.2 +
-            substr_similarity * 0.3 +
-            prefix_suffix_sim * 0.2
-        )
+        # Normalize strings (used and available names are pre-normalized per analysis)
+        s1 = self._norm_map.get(str1)
+        if s1 is None:
+            s1 = _norm(str1)
+        s2 = self._norm_map.get(str2)
+        if s2 is None:
+            s2 = _norm(str2)
         
-        return min(similarity, 0.95)  # Cap at 0.95 for non-exact matches
+        return _normalized_similarity(s1, s2)
     
-    def _find_pattern_matches(self, used_var: str, available_vars: List[str]) -> List[Tuple[str, float]]:
+    def _find_pattern_matches(self, used_var: str, available_vars: Set[str]) -> List[Tuple[str, float]]:
         """Find matches based on common naming patterns"""
         pattern_matches = []
         
-        for suffix1, suffix2 in self.NAMING_PATTERNS:
-            # Check if used_var ends with suffix1
-            if used_var.endswith('_' + suffix1):
-                prefix = used_var[:-len(suffix1)-1]
-                expected = prefix + '_' + suffix2
-                if expected in available_vars and expected != used_var:
-                    pattern_matches.append((expected, 0.9))
-            elif used_var.endswith(suffix1) and not used_var.endswith('_' + suffix1):
-                prefix = used_var[:-len(suffix1)]
-                expected = prefix + suffix2
-                if expected in available_vars and expected != used_var:
-                    pattern_matches.append((expected, 0.9))
+        for length in self._SUFFIX_LENGTHS:
+            if length > len(used_var):
+                break
+            replacements = self._SUFFIX_SWAPS.get(used_var[-length:])
+            if not replacements:
+                continue
             
-            # Check reverse direction (suffix2 -> suffix1)
-            if used_var.endswith('_' + suffix2):
-                prefix = used_var[:-len(suffix2)-1] 
-                expected = prefix + '_' + suffix1
-                if expected in available_vars and expected != used_var:
-                    pattern_matches.append((expected, 0.9))
-            elif used_var.endswith(suffix2) and not used_var.endswith('_' + suffix2):
-                prefix = used_var[:-len(suffix2)]
-                expected = prefix + suffix1
+            # Swapping the suffix keeps whatever separator precedes it
+            prefix = used_var[:-length]
+            for replacement in replacements:
+                expected = prefix + replacement
                 if expected in available_vars and expected != used_var:
                     pattern_matches.append((expected, 0.9))
         
         return pattern_matches
     
-    def _find_prefix_suffix_matches(self, used_var: str, available_vars: List[str]) -> List[Tuple[str, float]]:
+    def _find_prefix_suffix_matches(self, used_var: str, pool: _VariablePool) -> List[Tuple[str, float]]:
         """Find matches based on prefix/suffix variations"""
         matches = []
+        available_vars = pool.name_set
         
         # Try removing common prefixes from used_var
-        for prefix in self.COMMON_PREFIXES:
-            if used_var.startswith(prefix):
-                base_name = used_var[len(prefix):]
-                # Look for the base name with other prefixes
-                for available_var in available_vars:
-                    for other_prefix in self.COMMON_PREFIXES:
-                        if available_var.startswith(other_prefix):
-                            other_base = available_var[len(other_prefix):]
-                            if base_name == other_base:
-                                matches.append((available_var, 0.85))
-                    
-                    # Also check for base name without prefix
-                    if available_var == base_name:
-                        matches.append((available_var, 0.8))
-        
-        # Try adding common prefixes to used_var  
-        for prefix in self.COMMON_PREFIXES:
-            candidate = prefix + used_var
-            if candidate in available_vars:
-                matches.append((candidate, 0.85))
+        for prefix in self._match_prefixes(used_var):
+            base_name = used_var[len(prefix):]
+            # Look for the base name with other prefixes
+            for available_var in pool.base_names.get(base_name, ()):
+                matches.append((available_var, 0.85))
+            
+            # Also check for base name without prefix
+            if base_name in available_vars:
+                matches.append((base_name, 0.8))
+        
+        # Try adding common prefixes to used_var (i.e. used_var is their base name)
+        for candidate in pool.base_names.get(used_var, ()):
+            matches.append((candidate, 0.85))
         
         # Try removing suffixes
         common_suffixes = ['_URL', '_KEY', '_HOST', '_PORT', '_USER', '_PASSWORD']
@@ -422,21 +634,9 @@ class EnhancedEnvAnalyzer:
     
     def _find_sensitive_variables(self) -> List[str]:
         """Find variables that contain sensitive information"""
-        sensitive_vars = []
-        
-        sensitive_patterns = [
-            'password', 'passwd', 'pwd', 'secret', 'key', 'token',
-            'auth', 'credential', 'private', 'cert', 'ssl', 'api_key',
-            'access_key', 'private_key', 'client_secret'
-        ]
-        
         all_vars = self.used_vars | self.system_vars | self.file_vars
         
-        for var in all_vars:
-            if any(pattern in var.lower() for pattern in sensitive_patterns):
-                sensitive_vars.append(var)
-        
-        return sensitive_vars
+        return [var for var in all_vars if self._SENSITIVE_RE.search(var)]
     
     def _calculate_enhanced_statistics(self, mismatches: List[EnhancedMismatch], 
                                      perfect_matches: List[str],
@@ -451,19 +651,16 @@ class EnhancedEnvAnalyzer:
         total_file = len(self.file_vars)
         
         # Categorize mismatches by type
-        mismatch_types = {}
-        action_types = {}
-        for mismatch in mismatches:
-            issue_type = mismatch.issue_type
-            action_type = mismatch.recommended_action
-            
-            mismatch_types[issue_type] = mismatch_types.get(issue_type, 0) + 1
-            action_types[action_type] = action_types.get(action_type, 0) + 1
+        mismatch_types = dict(Counter(mismatch.issue_type for mismatch in mismatches))
+        action_types = dict(Counter(mismatch.recommended_action for mismatch in mismatches))
         
-        # Calculate enhanced health scores
+        # Calculate enhanced health scores; perfect matches are the used variables
+        # defined anywhere, so coverage follows from the categories without set intersections
         perfect_score = len(perfect_matches) / total_used * 100 if total_used > 0 else 100
-        system_coverage = len(self.used_vars & self.system_vars) / total_used * 100 if total_used > 0 else 0
-        file_coverage = len(self.used_vars & self.file_vars) / total_used * 100 if total_used > 0 else 0
+        system_covered = len(perfect_matches) - len(file_only_matches)
+        file_covered = len(perfect_matches) - len(system_only_matches)
+        system_coverage = system_covered / total_used * 100 if total_used > 0 else 0
+        file_coverage = file_covered / total_used * 100 if total_used > 0 else 0
         
         # Overall health considers both perfect matches and availability
         overall_health = (len(perfect_matches) + len(system_only_matches) + len(file_only_matches)) / total_used * 100 if total_used > 0 else 100
@@ -501,96 +698,94 @@ class EnhancedEnvAnalyzer:
     
     def generate_enhanced_report(self, result: EnhancedAnalysisResult) -> str:
         """Generate comprehensive analysis report"""
-        report = []
+        # Every line after the header is written with its leading newline
+        buf = io.StringIO()
+        w = buf.write
         
-        report.append("🏥 EnvDoctor Enhanced Analysis Report")
-        report.append("=" * 60)
+        w(_REPORT_HEADER)
         
         stats = result.statistics
         
         # Health overview
-        report.append(f"📊 Overall Health Score: {stats['overall_health_score']}%")
-        report.append(f"   Perfect Matches: {stats['perfect_matches']} ({stats['perfect_match_score']}%)")
-        report.append(f"   System Coverage: {stats['system_coverage_score']}%")
-        report.append(f"   File Coverage: {stats['file_coverage_score']}%")
+        w(f"\n📊 Overall Health Score: {stats['overall_health_score']}%")
+        w(f"\n   Perfect Matches: {stats['perfect_matches']} ({stats['perfect_match_score']}%)")
+        w(f"\n   System Coverage: {stats['system_coverage_score']}%")
+        w(f"\n   File Coverage: {stats['file_coverage_score']}%")
         
         # Environment overview
-        report.append(f"\n🌍 Environment Overview:")
-        report.append(f"   Variables Used in Code: {stats['total_variables_used']}")
-        report.append(f"   System Environment Variables: {stats['total_system_variables']}")
-        report.append(f"   File-based Variables: {stats['total_file_variables']}")
+        w("\n\n🌍 Environment Overview:")
+        w(f"\n   Variables Used in Code: {stats['total_variables_used']}")
+        w(f"\n   System Environment Variables: {stats['total_system_variables']}")
+        w(f"\n   File-based Variables: {stats['total_file_variables']}")
         
         # Match breakdown
         if result.system_only_matches:
-            report.append(f"\n🖥️ Available in System Only ({len(result.system_only_matches)}):")
-            for var in sorted(result.system_only_matches)[:10]:
-                report.append(f"   - {var}")
+            w(f"\n\n🖥️ Available in System Only ({len(result.system_only_matches)}):")
+            for var in heapq.nsmallest(10, result.system_only_matches):
+                w(f"\n   - {var}")
             if len(result.system_only_matches) > 10:
-                report.append(f"   ... and {len(result.system_only_matches) - 10} more")
+                w(f"\n   ... and {len(result.system_only_matches) - 10} more")
         
         if result.file_only_matches:
-            report.append(f"\n📄 Available in Files Only ({len(result.file_only_matches)}):")
-            for var in sorted(result.file_only_matches)[:10]:
-                report.append(f"   - {var}")
+            w(f"\n\n📄 Available in Files Only ({len(result.file_only_matches)}):")
+            for var in heapq.nsmallest(10, result.file_only_matches):
+                w(f"\n   - {var}")
             if len(result.file_only_matches) > 10:
-                report.append(f"   ... and {len(result.file_only_matches) - 10} more")
+                w(f"\n   ... and {len(result.file_only_matches) - 10} more")
         
         # Issues
         if result.mismatches:
-            report.append(f"\n❌ Issues Found ({len(result.mismatches)}):")
+            w(f"\n\n❌ Issues Found ({len(result.mismatches)}):")
             
             # Group by issue type
             for issue_type, count in stats['mismatch_types'].items():
-                report.append(f"   {issue_type}: {count}")
+                w(f"\n   {issue_type}: {count}")
             
-            report.append(f"\n🔧 Recommended Actions:")
+            w("\n\n🔧 Recommended Actions:")
             for action_type, count in stats['recommended_actions'].items():
-                report.append(f"   {action_type.replace('_', ' ').title()}: {count}")
+                w(f"\n   {action_type.replace('_', ' ').title()}: {count}")
             
-            report.append(f"\n📋 Detailed Issues:")
-            for i, mismatch in enumerate(result.mismatches[:5], 1):  # Show first 5
-                report.append(f"\n{i}. Variable: {mismatch.used_name}")
-                report.append(f"   Issue: {mismatch.issue_type}")
-                report.append(f"   Used in {len(mismatch.usages)} location(s)")
-                report.append(f"   Recommended: {mismatch.recommended_action}")
+            w("\n\n📋 Detailed Issues:")
+            for i, mismatch in enumerate(islice(result.mismatches, 5), 1):  # Show first 5
+                w(f"\n\n{i}. Variable: {mismatch.used_name}")
+                w(f"\n   Issue: {mismatch.issue_type}")
+                w(f"\n   Used in {len(mismatch.usages)} location(s)")
+                w(f"\n   Recommended: {mismatch.recommended_action}")
                 
                 if mismatch.system_available:
-                    report.append(f"   💡 Available in system environment")
+                    w("\n   💡 Available in system environment")
                 
                 if mismatch.file_available:
-                    report.append(f"   📄 Available in files: {', '.join(mismatch.file_available)}")
+                    w(f"\n   📄 Available in files: {', '.join(mismatch.file_available)}")
                 
                 if mismatch.suggested_matches:
-                    report.append(f"   Suggestions:")
-                    for j, (suggestion, confidence) in enumerate(zip(mismatch.suggested_matches[:3], mismatch.confidence_scores[:3]), 1):
+                    w("\n   Suggestions:")
+                    for j, (suggestion, confidence) in enumerate(islice(zip(mismatch.suggested_matches, mismatch.confidence_scores), 3), 1):
                         source = "🖥️ system" if suggestion in self.system_vars else "📄 file"
-                        report.append(f"     {j}. {suggestion} (confidence: {confidence:.0%}, {source})")
+                        w(f"\n     {j}. {suggestion} (confidence: {confidence:.0%}, {source})")
             
             if len(result.mismatches) > 5:
-                report.append(f"\n   ... and {len(result.mismatches) - 5} more issues")
+                w(f"\n\n   ... and {len(result.mismatches) - 5} more issues")
         
         # Security notice
         if result.sensitive_variables:
-            report.append(f"\n🔒 Sensitive Variables Detected ({len(result.sensitive_variables)}):")
-            report.append(f"   Please ensure these are properly secured and not committed to version control.")
-            for var in sorted(result.sensitive_variables)[:5]:
+            w(f"\n\n🔒 Sensitive Variables Detected ({len(result.sensitive_variables)}):")
+            w(_REPORT_SECURITY_NOTICE)
+            for var in heapq.nsmallest(5, result.sensitive_variables):
                 source = "🖥️" if var in self.system_vars else "📄"
-                report.append(f"   {source} {var}")
+                w(f"\n   {source} {var}")
             if len(result.sensitive_variables) > 5:
-                report.append(f"   ... and {len(result.sensitive_variables) - 5} more")
+                w(f"\n   ... and {len(result.sensitive_variables) - 5} more")
         
         # Recommendations
         if stats['overall_health_score'] >= 90:
-            report.append(f"\n🎉 Excellent! Your environment configuration is very well organized.")
+            w(_REPORT_EXCELLENT)
         elif stats['overall_health_score'] >= 70:
-            report.append(f"\n👍 Good configuration with minor issues that are easy to fix.")
-            report.append(f"💡 Consider running 'envdoctor --fix' for interactive resolution.")
+            w(_REPORT_GOOD)
         else:
-            report.append(f"\n⚠️ Several configuration issues found.")
-            report.append(f"🔧 Run 'envdoctor --fix' for guided resolution, or 'envdoctor --batch-fix' for automatic fixes.")
+            w(_REPORT_POOR)
         
-        return "\n".join(report)
-
+        return buf.getvalue()
 
 if __name__ == "__main__":
     # Test the enhanced analyzer
@@ -5,78 +5,303 @@ Comprehensive environment variable management suite
 
 import sys
 import argparse
+import importlib.util
+import logging
 import os
+import shutil
+from itertools import islice
+from operator import attrgetter
 from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional, Set, Tuple
 
-try:
-    from rich.console import Console
-    from rich.panel import Panel
-    from rich import print as rprint
-    from rich.progress import Progress, SpinnerColumn, TextColumn
-    from rich.table import Table
-    RICH_AVAILABLE = True
-except ImportError:
-    RICH_AVAILABLE = False
-    Console = None
+# Rich is only imported once something is rendered, keeping --help/--version fast
+RICH_AVAILABLE = importlib.util.find_spec('rich') is not None
+_rich = None
+
+def _get_rich():
+    """Import and cache the Rich components used by the CLI (None without Rich)"""
+    global _rich
+    if _rich is None and RICH_AVAILABLE:
+        from rich.console import Console, Group
+        from rich.panel import Panel
+        from rich import print as rich_print
+        from rich.progress import Progress, SpinnerColumn, TextColumn
+        from rich.table import Table
+        _rich = SimpleNamespace(
+            Console=Console, Group=Group, Panel=Panel, print=rich_print,
+            Progress=Progress, SpinnerColumn=SpinnerColumn, TextColumn=TextColumn,
+            Table=Table,
+        )
+    return _rich
+
+def rprint(*objects, **kwargs):
+    """Rich print, importing Rich on first use"""
+    _get_rich().print(*objects, **kwargs)
 
 from . import __version__
 from .manager import EnvManager
-from .scanner import EnhancedEnvScanner
-from .analyzer import EnhancedEnvAnalyzer
+from .scanner import EnhancedEnvScanner, EnvUsage, ScanResult
+from .analyzer import EnhancedEnvAnalyzer, EnhancedAnalysisResult
 from .fixer import EnhancedEnvFixer
 
+def _help_cache_file() -> Optional[Path]:
+    """Where the rendered top-level help is kept, or None if it cannot be keyed
+    
+    The name holds the version, the terminal width and the mtime and size of
+    this module, so editing the options (e.g. in a dev install) never serves
+    a stale rendering.
+    """
+    try:
+        stat = os.stat(__file__)
+    except OSError:
+        return None
+    cache_root = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    width = shutil.get_terminal_size().columns
+    return Path(cache_root) / 'envdoctor' / f'help-{__version__}-{width}-{stat.st_mtime_ns:x}-{stat.st_size:x}.txt'
+
+def _unique_variable_names(result) -> Set[str]:
+    """Distinct variable names referenced by a scan result's usages"""
+    return set(map(attrgetter('variable_name'), result.usages))
+
+def _usage_detail(usage: EnvUsage) -> Dict[str, Any]:
+    """Saved-results summary of a single usage"""
+    return {
+        'variable': usage.variable_name,
+        'file': usage.file_path,
+        'line': usage.line_number,
+        'method': usage.access_method
+    }
+
+def _json_default(obj):
+    """Encode usages as the JSON encoder reaches them"""
+    if isinstance(obj, EnvUsage):
+        return _usage_detail(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+class _PlainPrinter:
+    """Console output without Rich"""
+    
+    __slots__ = ()
+    
+    def banner(self):
+        """Print the plain-text banner"""
+        print(f"EnvDoctor v{__version__} - Environment Variable Management Suite")
+        print("=" * 60)
+    
+    def say(self, markup: str, plain: Optional[str] = None):
+        """Print a message's plain form; messages without one are Rich-only"""
+        if plain is not None:
+            print(plain)
+
+class _RichPrinter:
+    """Console output through Rich"""
+    
+    __slots__ = ()
+    
+    def banner(self):
+        """Print the banner in a Rich panel"""
+        rich = _get_rich()
+        banner = """
+🏥 EnvDoctor v{version} - Complete Environment Variable Management Suite
+
+   Detect • Analyze • Fix • Manage
+   System Environment • File Configuration • Code Usage
+        """.format(version=__version__)
+        
+        rich.print(rich.Panel(banner, border_style="blue", padding=(1, 2)))
+    
+    def say(self, markup: str, plain: Optional[str] = None):
+        """Print a message's Rich markup form"""
+        rprint(markup)
+
+class _RichProgress:
+    """Transient Rich spinner shown while a step runs"""
+    
+    __slots__ = ('desc', 'console', 'progress')
+    
+    def __init__(self, desc, console):
+        self.desc = desc
+        self.console = console
+        self.progress = None
+    
+    def __enter__(self):
+        rich = _get_rich()
+        self.progress = rich.Progress(
+            rich.SpinnerColumn(),
+            rich.TextColumn("[progress.description]{task.description}"),
+            console=self.console,
+            transient=True
+        )
+        self.progress.start()
+        self.progress.add_task(self.desc)
+        return self
+    
+    def __exit__(self, *args):
+        if self.progress:
+            self.progress.stop()
+
+class _SimpleProgress:
+    """Fallback progress context that just prints the description"""
+    
+    __slots__ = ('desc',)
+    
+    def __init__(self, desc):
+        self.desc = desc
+    
+    def __enter__(self):
+        print(f"{self.desc}")
+        return self
+    
+    def __exit__(self, *args):
+        pass
+
+def _one_of(*choices):
+    """Fast-path converter accepting only the given values"""
+    def convert(value):
+        if value not in choices:
+            raise ValueError(value)
+        return value
+    return convert
+
 class EnvDoctorCLI:
     """Main CLI handler for EnvDoctor"""
     
+    # Subcommands in help order; each has an _add_<name>_arguments builder
+    # and a cmd_<name> handler
+    SUBCOMMANDS = (
+        ('scan', 'Scan project for environment variable usage'),
+        ('analyze', 'Analyze environment variable configuration'),
+        ('fix', 'Fix environment variable issues'),
+        ('setup', 'Smart .env file setup and management'),
+        ('manage', 'Complete environment variable overview and management'),
+        ('health', 'Quick environment health check'),
+        ('doctor', 'Comprehensive environment checkup (scan + analyze + recommendations)'),
+    )
+    
+    # Subcommand options understood by the argparse-free fast path in run(),
+    # mirroring _add_<name>_arguments: option -> (dest, converter), where a
+    # None converter marks a store_true switch. tests/test_cli_args.py checks
+    # these and FAST_DEFAULTS against the argparse definitions
+    FAST_OPTIONS = {
+        'scan': {
+            '--output-format': ('output_format', _one_of('text', 'json', 'yaml')),
+            '-f': ('output_format', _one_of('text', 'json', 'yaml')),
+            '--save-results': ('save_results', str),
+            '-s': ('save_results', str),
+        },
+        'analyze': {
+            '--detailed': ('detailed', None),
+            '-d': ('detailed', None),
+            '--report': ('report', str),
+        },
+        'fix': {
+            '--batch': ('batch', None),
+            '-b': ('batch', None),
+            '--confidence': ('confidence', float),
+            '-c': ('confidence', float),
+            '--backup-dir': ('backup_dir', str),
+        },
+        'setup': {
+            '--force': ('force', None),
+        },
+        'manage': {
+            '--show-system': ('show_system', None),
+            '--show-files': ('show_files', None),
+            '--show-sensitive': ('show_sensitive', None),
+        },
+        'health': {
+            '--score-only': ('score_only', None),
+        },
+        'doctor': {
+            '--fix-suggestions': ('fix_suggestions', None),
+        },
+    }
+    
+    # Values of subcommand options that are not given
+    FAST_DEFAULTS = {
+        'scan': {'output_format': 'text', 'save_results': None},
+        'analyze': {'detailed': False, 'report': None},
+        'fix': {'batch': False, 'confidence': 0.9, 'backup_dir': None},
+        'setup': {'force': False},
+        'manage': {'show_system': False, 'show_files': False, 'show_sensitive': False},
+        'health': {'score_only': False},
+        'doctor': {'fix_suggestions': False},
+    }
+    
     def __init__(self):
-        self.console = Console() if RICH_AVAILABLE else None
+        self._console = None
+        # Built parsers keyed by the subcommand they were specialised for
+        self._parsers: Dict[Optional[str], argparse.ArgumentParser] = {}
+        # Rich or plain output, chosen once instead of at every message
+        self.out = _RichPrinter() if RICH_AVAILABLE else _PlainPrinter()
+        # Scans and analyses of the current run, keyed by resolved project root
+        self._scans: Dict[str, ScanResult] = {}
+        self._analyses: Dict[str, Tuple[EnhancedEnvAnalyzer, EnhancedAnalysisResult]] = {}
+    
+    @property
+    def console(self):
+        """Rich console, created on first use"""
+        if self._console is None and RICH_AVAILABLE:
+            self._console = _get_rich().Console()
+        return self._console
         
     def print_banner(self):
         """Print the EnvDoctor banner"""
-        if RICH_AVAILABLE:
-            banner = """
-🏥 EnvDoctor v{version} - Complete Environment Variable Management Suite
-
-   Detect • Analyze • Fix • Manage
-   System Environment • File Configuration • Code Usage
-            """.format(version=__version__)
-            
-            rprint(Panel(banner, border_style="blue", padding=(1, 2)))
-        else:
-            print(f"EnvDoctor v{__version__} - Environment Variable Management Suite")
-            print("=" * 60)
+        self.out.banner()
     
     def run(self):
         """Main CLI entry point"""
-        parser = self.create_parser()
-        args = parser.parse_args()
+        argv = sys.argv[1:]
+        
+        # Results are only reused within one run; files may change between runs
+        self._clear_project_cache()
+        
+        # Bare `envdoctor --help` is served from a cached rendering
+        if argv in (['--help'], ['-h']):
+            return self._print_cached_help()
+        
+        # Plain `<command> [options]` runs skip argparse entirely; help,
+        # global flags and anything unexpected go through the full parser
+        args = self._fast_parse(argv)
+        if args is None:
+            parser = self.create_parser(argv)
+            args = parser.parse_args(argv)
+        
+        # Library progress messages go through logging; surface them in verbose mode
+        if args.verbose:
+            logging.basicConfig(level=logging.INFO, format='%(message)s')
         
         # Handle help and version first
         if hasattr(args, 'func'):
             try:
                 return args.func(args)
             except KeyboardInterrupt:
-                if RICH_AVAILABLE:
-                    rprint("\n[yellow]⏹️ Operation interrupted by user[/yellow]")
-                else:
-                    print("\nOperation interrupted by user")
+                self.out.say("\n[yellow]⏹️ Operation interrupted by user[/yellow]", "\nOperation interrupted by user")
                 return 1
             except Exception as e:
                 if args.verbose:
                     import traceback
                     traceback.print_exc()
                 else:
-                    if RICH_AVAILABLE:
-                        rprint(f"[red]❌ Error: {str(e)}[/red]")
-                    else:
-                        print(f"Error: {str(e)}")
+                    self.out.say(f"[red]❌ Error: {str(e)}[/red]", f"Error: {str(e)}")
                 return 1
         else:
             parser.print_help()
             return 0
     
-    def create_parser(self) -> argparse.ArgumentParser:
-        """Create the argument parser"""
+    def create_parser(self, argv: Optional[List[str]] = None) -> argparse.ArgumentParser:
+        """Create the argument parser
+        
+        Only the subcommand named in argv gets its arguments; all of them are
+        built when no subcommand can be picked out (e.g. plain --help).
+        Parsers keep no state between parse_args calls, so each variant is
+        built once per CLI instance.
+        """
+        selected = self._selected_command(argv) if argv is not None else None
+        parser = self._parsers.get(selected)
+        if parser is not None:
+            return parser
         
         parser = argparse.ArgumentParser(
             prog='envdoctor',
@@ -125,142 +350,188 @@ For more information: https://github.com/trackergenai/envdoctor
         # Subcommands
         subparsers = parser.add_subparsers(dest='command', help='Available commands')
         
-        # Scan command
-        scan_parser = subparsers.add_parser(
-            'scan',
-            help='Scan project for environment variable usage'
-        )
-        scan_parser.add_argument(
+        for name, help_text in self.SUBCOMMANDS:
+            subparser = subparsers.add_parser(name, help=help_text)
+            if selected is None or selected == name:
+                getattr(self, f'_add_{name}_arguments')(subparser)
+            subparser.set_defaults(func=getattr(self, f'cmd_{name}'))
+        
+        self._parsers[selected] = parser
+        return parser
+    
+    def _print_cached_help(self) -> int:
+        """Print the top-level help, rendering and caching it on first use"""
+        cache_file = _help_cache_file()
+        if cache_file is None:
+            sys.stdout.write(self.create_parser().format_help())
+            return 0
+        try:
+            help_text = cache_file.read_text(encoding='utf-8')
+        except OSError:
+            help_text = self.create_parser().format_help()
+            try:
+                cache_file.parent.mkdir(parents=True, exist_ok=True)
+                cache_file.write_text(help_text, encoding='utf-8')
+            except OSError:
+                pass  # Caching is best effort; the help is still printed
+        
+        sys.stdout.write(help_text)
+        return 0
+    
+    def _fast_parse(self, argv: List[str]) -> Optional[argparse.Namespace]:
+        """Parse `<command> [options]` without argparse (None to fall back)"""
+        if not argv or argv[0] not in self.FAST_OPTIONS:
+            return None
+        
+        command = argv[0]
+        options = self.FAST_OPTIONS[command]
+        values = {'verbose': False, 'project_root': '.', 'dry_run': False, 'command': command}
+        values.update(self.FAST_DEFAULTS[command])
+        
+        remaining = iter(argv[1:])
+        for arg in remaining:
+            option = options.get(arg)
+            if option is None:
+                return None
+            dest, convert = option
+            if convert is None:
+                values[dest] = True
+                continue
+            
+            value = next(remaining, None)
+            if value is None or value.startswith('-'):
+                return None
+            try:
+                values[dest] = convert(value)
+            except ValueError:
+                return None
+        
+        values['func'] = getattr(self, f'cmd_{command}')
+        return argparse.Namespace(**values)
+    
+    def _selected_command(self, argv: List[str]) -> Optional[str]:
+        """Find the subcommand in argv, skipping the value of --project-root"""
+        command_names = {name for name, _ in self.SUBCOMMANDS}
+        expects_value = False
+        for arg in argv:
+            if expects_value:
+                expects_value = False
+            elif arg in command_names:
+                return arg
+            elif arg == '-p' or (arg.startswith('--p') and '--project-root'.startswith(arg)):
+                expects_value = True
+            elif not arg.startswith('-'):
+                return None
+        return None
+    
+    def _add_scan_arguments(self, parser: argparse.ArgumentParser):
+        """Add the scan subcommand's arguments"""
+        parser.add_argument(
             '--output-format', '-f',
             choices=['text', 'json', 'yaml'],
             default='text',
             help='Output format'
         )
-        scan_parser.add_argument(
+        parser.add_argument(
             '--save-results', '-s',
             type=str,
             help='Save scan results to file'
         )
-        scan_parser.set_defaults(func=self.cmd_scan)
-        
-        # Analyze command
-        analyze_parser = subparsers.add_parser(
-            'analyze',
-            help='Analyze environment variable configuration'
-        )
-        analyze_parser.add_argument(
+    
+    def _add_analyze_arguments(self, parser: argparse.ArgumentParser):
+        """Add the analyze subcommand's arguments"""
+        parser.add_argument(
             '--detailed', '-d',
             action='store_true',
             help='Show detailed analysis including suggestions'
         )
-        analyze_parser.add_argument(
+        parser.add_argument(
             '--report',
             type=str,
             help='Save analysis report to file'
         )
-        analyze_parser.set_defaults(func=self.cmd_analyze)
-        
-        # Fix command
-        fix_parser = subparsers.add_parser(
-            'fix',
-            help='Fix environment variable issues'
-        )
-        fix_parser.add_argument(
+    
+    def _add_fix_arguments(self, parser: argparse.ArgumentParser):
+        """Add the fix subcommand's arguments"""
+        parser.add_argument(
             '--batch', '-b',
             action='store_true',
             help='Batch fix mode (automatic for high confidence issues)'
         )
-        fix_parser.add_argument(
+        parser.add_argument(
             '--confidence', '-c',
             type=float,
             default=0.9,
             help='Minimum confidence for batch fixes (default: 0.9)'
         )
-        fix_parser.add_argument(
+        parser.add_argument(
             '--backup-dir',
             type=str,
             help='Custom backup directory'
         )
-        fix_parser.set_defaults(func=self.cmd_fix)
-        
-        # Setup command
-        setup_parser = subparsers.add_parser(
-            'setup',
-            help='Smart .env file setup and management'
-        )
-        setup_parser.add_argument(
+    
+    def _add_setup_arguments(self, parser: argparse.ArgumentParser):
+        """Add the setup subcommand's arguments"""
+        parser.add_argument(
             '--force',
             action='store_true',
             help='Force recreate .env file even if it exists'
         )
-        setup_parser.set_defaults(func=self.cmd_setup)
-        
-        # Manage command
-        manage_parser = subparsers.add_parser(
-            'manage',
-            help='Complete environment variable overview and management'
-        )
-        manage_parser.add_argument(
+    
+    def _add_manage_arguments(self, parser: argparse.ArgumentParser):
+        """Add the manage subcommand's arguments"""
+        parser.add_argument(
             '--show-system',
             action='store_true',
             help='Show system environment variables'
         )
-        manage_parser.add_argument(
+        parser.add_argument(
             '--show-files',
             action='store_true',
             help='Show file-based variables'
         )
-        manage_parser.add_argument(
+        parser.add_argument(
             '--show-sensitive',
             action='store_true',
             help='Show sensitive variables (use with caution)'
         )
-        manage_parser.set_defaults(func=self.cmd_manage)
-        
-        # Health command
-        health_parser = subparsers.add_parser(
-            'health',
-            help='Quick environment health check'
-        )
-        health_parser.add_argument(
+    
+    def _add_health_arguments(self, parser: argparse.ArgumentParser):
+        """Add the health subcommand's arguments"""
+        parser.add_argument(
             '--score-only',
             action='store_true',
             help='Show only the health score'
         )
-        health_parser.set_defaults(func=self.cmd_health)
-        
-        # Doctor command (comprehensive check)
-        doctor_parser = subparsers.add_parser(
-            'doctor',
-            help='Comprehensive environment checkup (scan + analyze + recommendations)'
-        )
-        doctor_parser.add_argument(
+    
+    def _add_doctor_arguments(self, parser: argparse.ArgumentParser):
+        """Add the doctor subcommand's arguments"""
+        parser.add_argument(
             '--fix-suggestions',
             action='store_true',
             help='Include fix suggestions in the checkup'
         )
-        doctor_parser.set_defaults(func=self.cmd_doctor)
-        
-        return parser
     
     def cmd_scan(self, args) -> int:
         """Scan command implementation"""
         self.print_banner()
         
         if RICH_AVAILABLE:
-            rprint(f"[cyan]🔍 Scanning project: {Path(args.project_root).resolve()}[/cyan]")
+            self.out.say(f"[cyan]🔍 Scanning project: {os.path.abspath(args.project_root)}[/cyan]")
         
-        scanner = EnhancedEnvScanner(args.project_root)
+        result = self._scan(args.project_root, "Scanning project files...")
         
-        with self._progress_context("Scanning project files..."):
-            result = scanner.scan_everything()
+        # Distinct variable names, shared by every output below; the text
+        # display and text save both list them sorted, so sort only once
+        unique_vars = _unique_variable_names(result)
+        sorted_vars = sorted(unique_vars) if args.output_format == 'text' else None
         
         # Display results
         if args.output_format == 'json':
             import json
             output = {
                 'statistics': result.usage_stats,
-                'variables_used': list(set(usage.variable_name for usage in result.usages)),
+                'variables_used': list(unique_vars),
                 'system_variables_count': len(result.system_variables),
                 'file_variables': {k: list(v.keys()) for k, v in result.file_variables.items()},
             }
@@ -271,34 +542,26 @@ For more information: https://github.com/trackergenai/envdoctor
                 import yaml
                 output = {
                     'statistics': result.usage_stats,
-                    'variables_used': list(set(usage.variable_name for usage in result.usages)),
+                    'variables_used': list(unique_vars),
                     'system_variables_count': len(result.system_variables),
                     'file_variables': {k: list(v.keys()) for k, v in result.file_variables.items()},
                 }
                 print(yaml.dump(output, default_flow_style=False))
             except ImportError:
-                if RICH_AVAILABLE:
-                    rprint("[red]❌ PyYAML not installed. Use 'pip install pyyaml' for YAML output.[/red]")
-                else:
-                    print("PyYAML not installed. Use 'pip install pyyaml' for YAML output.")
+                self.out.say("[red]❌ PyYAML not installed. Use 'pip install pyyaml' for YAML output.[/red]", "PyYAML not installed. Use 'pip install pyyaml' for YAML output.")
                 return 1
         
         else:  # text format
-            self._display_scan_results_text(result)
+            self._display_scan_results_text(result, sorted_vars)
         
         # Save results if requested
         if args.save_results:
             try:
-                self._save_scan_results(result, args.save_results, args.output_format)
-                if RICH_AVAILABLE:
-                    rprint(f"[green]💾 Results saved to: {args.save_results}[/green]")
-                else:
-                    print(f"Results saved to: {args.save_results}")
+                self._save_scan_results(result, args.save_results, args.output_format,
+                                        unique_vars, sorted_vars)
+                self.out.say(f"[green]💾 Results saved to: {args.save_results}[/green]", f"Results saved to: {args.save_results}")
             except Exception as e:
-                if RICH_AVAILABLE:
-                    rprint(f"[red]❌ Failed to save results: {str(e)}[/red]")
-                else:
-                    print(f"Failed to save results: {str(e)}")
+                self.out.say(f"[red]❌ Failed to save results: {str(e)}[/red]", f"Failed to save results: {str(e)}")
         
         return 0
     
@@ -306,38 +569,24 @@ For more information: https://github.com/trackergenai/envdoctor
         """Analyze command implementation"""
         self.print_banner()
         
-        # First scan
-        scanner = EnhancedEnvScanner(args.project_root)
-        with self._progress_context("Scanning project..."):
-            scan_result = scanner.scan_everything()
-        
-        # Then analyze
-        analyzer = EnhancedEnvAnalyzer()
-        with self._progress_context("Analyzing environment configuration..."):
-            analysis_result = analyzer.analyze_enhanced(scan_result)
+        # First scan, then analyze
+        analyzer, analysis_result = self._analyze(
+            args.project_root, "Scanning project...", "Analyzing environment configuration..."
+        )
         
         # Display results
         report = analyzer.generate_enhanced_report(analysis_result)
         
-        if RICH_AVAILABLE:
-            rprint(report)
-        else:
-            print(report)
+        self.out.say(report, report)
         
         # Save report if requested
         if args.report:
             try:
                 with open(args.report, 'w', encoding='utf-8') as f:
                     f.write(report)
-                if RICH_AVAILABLE:
-                    rprint(f"\n[green]📄 Report saved to: {args.report}[/green]")
-                else:
-                    print(f"\nReport saved to: {args.report}")
+                self.out.say(f"\n[green]📄 Report saved to: {args.report}[/green]", f"\nReport saved to: {args.report}")
             except Exception as e:
-                if RICH_AVAILABLE:
-                    rprint(f"[red]❌ Failed to save report: {str(e)}[/red]")
-                else:
-                    print(f"Failed to save report: {str(e)}")
+                self.out.say(f"[red]❌ Failed to save report: {str(e)}[/red]", f"Failed to save report: {str(e)}")
         
         # Return exit code based on health
         health_score = analysis_result.statistics.get('overall_health_score', 0)
@@ -353,18 +602,10 @@ For more information: https://github.com/trackergenai/envdoctor
         self.print_banner()
         
         # Get analysis first
-        scanner = EnhancedEnvScanner(args.project_root)
-        with self._progress_context("Scanning and analyzing..."):
-            scan_result = scanner.scan_everything()
-            
-            analyzer = EnhancedEnvAnalyzer()
-            analysis_result = analyzer.analyze_enhanced(scan_result)
+        _, analysis_result = self._analyze(args.project_root, "Scanning and analyzing...")
         
         if not analysis_result.mismatches:
-            if RICH_AVAILABLE:
-                rprint("[green]🎉 No issues found to fix![/green]")
-            else:
-                print("No issues found to fix!")
+            self.out.say("[green]🎉 No issues found to fix![/green]", "No issues found to fix!")
             return 0
         
         # Initialize fixer
@@ -372,14 +613,15 @@ For more information: https://github.com/trackergenai/envdoctor
         
         # Apply fixes
         if args.batch:
-            if RICH_AVAILABLE:
-                rprint(f"[yellow]🤖 Batch fixing with confidence threshold: {args.confidence:.0%}[/yellow]")
+            self.out.say(f"[yellow]🤖 Batch fixing with confidence threshold: {args.confidence:.0%}[/yellow]")
             fix_result = fixer.batch_fix(analysis_result, args.confidence)
         else:
-            if RICH_AVAILABLE:
-                rprint("[cyan]🔧 Interactive fix mode[/cyan]")
+            self.out.say("[cyan]🔧 Interactive fix mode[/cyan]")
             fix_result = fixer.interactive_fix(analysis_result)
         
+        # Fixes change the project, so earlier scans no longer apply
+        self._clear_project_cache()
+        
         # Return appropriate exit code
         if fix_result.success_count == fix_result.total_count:
             return 0  # All fixes succeeded
@@ -394,6 +636,7 @@ For more information: https://github.com/trackergenai/envdoctor
         
         manager = EnvManager(args.project_root)
         success = manager.smart_env_setup()
+        self._clear_project_cache()
         
         return 0 if success else 1
     
@@ -408,8 +651,7 @@ For more information: https://github.com/trackergenai/envdoctor
         
         # Additional detailed views if requested
         if args.show_system or args.show_files or args.show_sensitive:
-            if RICH_AVAILABLE:
-                rprint("\n[cyan]🔍 Detailed View[/cyan]")
+            self.out.say("\n[cyan]🔍 Detailed View[/cyan]")
             
             if args.show_system:
                 self._show_system_variables()
@@ -425,44 +667,36 @@ For more information: https://github.com/trackergenai/envdoctor
     def cmd_health(self, args) -> int:
         """Health command implementation"""
         
-        if not args.score_only:
-            self.print_banner()
+        if args.score_only:
+            # Scan, analyze, print one number: no banner, progress output or Rich
+            _, analysis_result = self._analyze_project(args.project_root)
+            print(f"{analysis_result.statistics.get('overall_health_score', 0):.1f}")
+            return 0
+        
+        self.print_banner()
         
         # Quick health check
-        scanner = EnhancedEnvScanner(args.project_root)
-        with self._progress_context("Quick health scan..."):
-            scan_result = scanner.scan_everything()
-            
-            analyzer = EnhancedEnvAnalyzer()
-            analysis_result = analyzer.analyze_enhanced(scan_result)
+        _, analysis_result = self._analyze(args.project_root, "Quick health scan...")
         
         health_score = analysis_result.statistics.get('overall_health_score', 0)
         
-        if args.score_only:
-            print(f"{health_score:.1f}")
-            return 0
-        
         # Display health summary
-        if RICH_AVAILABLE:
-            if health_score >= 90:
-                rprint(f"[green]🎉 Health Score: {health_score:.1f}% - Excellent![/green]")
-            elif health_score >= 70:
-                rprint(f"[yellow]👍 Health Score: {health_score:.1f}% - Good[/yellow]")
-            else:
-                rprint(f"[red]⚠️ Health Score: {health_score:.1f}% - Needs Attention[/red]")
+        plain_score = f"Health Score: {health_score:.1f}%"
+        if health_score >= 90:
+            self.out.say(f"[green]🎉 Health Score: {health_score:.1f}% - Excellent![/green]", plain_score)
+        elif health_score >= 70:
+            self.out.say(f"[yellow]👍 Health Score: {health_score:.1f}% - Good[/yellow]", plain_score)
         else:
-            print(f"Health Score: {health_score:.1f}%")
+            self.out.say(f"[red]⚠️ Health Score: {health_score:.1f}% - Needs Attention[/red]", plain_score)
         
         # Quick summary
         stats = analysis_result.statistics
-        if RICH_AVAILABLE:
-            rprint(f"   Variables Used: {stats.get('total_variables_used', 0)}")
-            rprint(f"   Perfect Matches: {stats.get('perfect_matches', 0)}")
-            rprint(f"   Issues Found: {stats.get('mismatches', 0)}")
+        self.out.say(f"   Variables Used: {stats.get('total_variables_used', 0)}")
+        self.out.say(f"   Perfect Matches: {stats.get('perfect_matches', 0)}")
+        self.out.say(f"   Issues Found: {stats.get('mismatches', 0)}")
         
         if health_score < 70:
-            if RICH_AVAILABLE:
-                rprint(f"\n[dim]💡 Run 'envdoctor analyze' for details or 'envdoctor fix' to resolve issues[/dim]")
+            self.out.say(f"\n[dim]💡 Run 'envdoctor analyze' for details or 'envdoctor fix' to resolve issues[/dim]")
         
         return 0 if health_score >= 70 else 1
     
@@ -470,83 +704,79 @@ For more information: https://github.com/trackergenai/envdoctor
         """Doctor command - comprehensive checkup"""
         self.print_banner()
         
-        if RICH_AVAILABLE:
-            rprint("[bold cyan]🩺 Comprehensive Environment Checkup[/bold cyan]")
+        self.out.say("[bold cyan]🩺 Comprehensive Environment Checkup[/bold cyan]")
         
         # Full pipeline
-        scanner = EnhancedEnvScanner(args.project_root)
-        with self._progress_context("Comprehensive scan..."):
-            scan_result = scanner.scan_everything()
-        
-        analyzer = EnhancedEnvAnalyzer()
-        with self._progress_context("Deep analysis..."):
-            analysis_result = analyzer.analyze_enhanced(scan_result)
+        analyzer, analysis_result = self._analyze(
+            args.project_root, "Comprehensive scan...", "Deep analysis..."
+        )
         
         # Show full report
         report = analyzer.generate_enhanced_report(analysis_result)
-        if RICH_AVAILABLE:
-            rprint(report)
-        else:
-            print(report)
+        self.out.say(report, report)
         
         # Show fix suggestions if requested
         if args.fix_suggestions and analysis_result.mismatches:
-            if RICH_AVAILABLE:
-                rprint(f"\n[cyan]🔧 Fix Suggestions[/cyan]")
-                rprint(f"Run one of these commands to fix the issues:")
-                rprint(f"   • envdoctor fix                     # Interactive fixes")
-                rprint(f"   • envdoctor fix --batch             # Auto-fix high confidence issues")
-                rprint(f"   • envdoctor fix --batch -c 0.8      # Auto-fix medium+ confidence issues")
+            self.out.say(f"\n[cyan]🔧 Fix Suggestions[/cyan]")
+            self.out.say(f"Run one of these commands to fix the issues:")
+            self.out.say(f"   • envdoctor fix                     # Interactive fixes")
+            self.out.say(f"   • envdoctor fix --batch             # Auto-fix high confidence issues")
+            self.out.say(f"   • envdoctor fix --batch -c 0.8      # Auto-fix medium+ confidence issues")
         
         # Return based on health
         health_score = analysis_result.statistics.get('overall_health_score', 0)
         return 0 if health_score >= 90 else (1 if health_score >= 70 else 2)
     
+    def _scan(self, project_root: str, description: str) -> ScanResult:
+        """Run the (memoized) project scan under a progress message"""
+        with self._progress_context(description):
+            return self._scan_project(project_root)
+    
+    def _analyze(self, project_root: str, *descriptions: str
+                 ) -> Tuple[EnhancedEnvAnalyzer, EnhancedAnalysisResult]:
+        """Run the (memoized) scan and analysis under progress messages
+        
+        One description covers both steps; with two, the scan and the
+        analysis are shown separately.
+        """
+        if len(descriptions) > 1:
+            self._scan(project_root, descriptions[0])
+        with self._progress_context(descriptions[-1]):
+            return self._analyze_project(project_root)
+    
+    def _scan_project(self, project_root: str) -> ScanResult:
+        """Scan a project, memoized per resolved project root for the current run"""
+        key = os.path.realpath(project_root)
+        result = self._scans.get(key)
+        if result is None:
+            result = self._scans[key] = EnhancedEnvScanner(project_root).scan_everything()
+        return result
+    
+    def _analyze_project(self, project_root: str) -> Tuple[EnhancedEnvAnalyzer, EnhancedAnalysisResult]:
+        """Analyze a project's (memoized) scan; the analyzer is kept for reporting"""
+        key = os.path.realpath(project_root)
+        analysis = self._analyses.get(key)
+        if analysis is None:
+            analyzer = EnhancedEnvAnalyzer()
+            analysis = self._analyses[key] = (analyzer, analyzer.analyze_enhanced(self._scan_project(project_root)))
+        return analysis
+    
+    def _clear_project_cache(self):
+        """Forget memoized scans/analyses, e.g. after files were modified"""
+        self._scans.clear()
+        self._analyses.clear()
+    
     def _progress_context(self, description: str):
         """Create a progress context manager"""
         if RICH_AVAILABLE:
-            class ProgressContext:
-                def __init__(self, desc, console):
-                    self.desc = desc
-                    self.console = console
-                    self.progress = None
-                
-                def __enter__(self):
-                    self.progress = Progress(
-                        SpinnerColumn(),
-                        TextColumn("[progress.description]{task.description}"),
-                        console=self.console,
-                        transient=True
-                    )
-                    self.progress.start()
-                    self.progress.add_task(self.desc)
-                    return self
-                
-                def __exit__(self, *args):
-                    if self.progress:
-                        self.progress.stop()
-            
-            return ProgressContext(description, self.console)
-        else:
-            # Fallback context manager that just prints the description
-            class SimpleProgress:
-                def __init__(self, desc):
-                    self.desc = desc
-                def __enter__(self):
-                    print(f"{self.desc}")
-                    return self
-                def __exit__(self, *args):
-                    pass
-            
-            return SimpleProgress(description)
+            return _RichProgress(description, self.console)
+        return _SimpleProgress(description)
     
-    def _display_scan_results_text(self, result):
+    def _display_scan_results_text(self, result, sorted_vars: Optional[List[str]] = None):
         """Display scan results in text format"""
         
-        if RICH_AVAILABLE:
-            rprint(f"\n[cyan]📊 Scan Results[/cyan]")
-            
-            stats_table = Table(title="Statistics")
+        if (rich := _get_rich()):
+            stats_table = rich.Table(title="Statistics")
             stats_table.add_column("Metric", style="cyan")
             stats_table.add_column("Count", style="green")
             
@@ -554,26 +784,31 @@ For more information: https://github.com/trackergenai/envdoctor
                 readable_key = key.replace('_', ' ').title()
                 stats_table.add_row(readable_key, str(value))
             
-            self.console.print(stats_table)
+            # Collect the listings as markup lines and render everything at once
+            lines = []
             
             # Show used variables
-            used_vars = sorted(set(usage.variable_name for usage in result.usages))
+            used_vars = sorted_vars if sorted_vars is not None else sorted(_unique_variable_names(result))
             if used_vars:
-                rprint(f"\n[cyan]🔍 Variables Used in Code ({len(used_vars)}):[/cyan]")
-                for var in used_vars[:20]:  # Show first 20
-                    rprint(f"   - {var}")
+                lines.append(f"\n[cyan]🔍 Variables Used in Code ({len(used_vars)}):[/cyan]")
+                lines.extend(f"   - {var}" for var in used_vars[:20])  # Show first 20
                 if len(used_vars) > 20:
-                    rprint(f"   ... and {len(used_vars) - 20} more")
+                    lines.append(f"   ... and {len(used_vars) - 20} more")
             
             # Show file variables
             if result.file_variables:
-                rprint(f"\n[cyan]📄 File-based Variables:[/cyan]")
+                lines.append(f"\n[cyan]📄 File-based Variables:[/cyan]")
                 for filename, variables in result.file_variables.items():
-                    rprint(f"   {filename}: {len(variables)} variables")
-                    for var in list(variables.keys())[:5]:  # Show first 5
-                        rprint(f"      - {var}")
+                    lines.append(f"   {filename}: {len(variables)} variables")
+                    lines.extend(f"      - {var}" for var in islice(variables, 5))  # Show first 5
                     if len(variables) > 5:
-                        rprint(f"      ... and {len(variables) - 5} more")
+                        lines.append(f"      ... and {len(variables) - 5} more")
+            
+            console = self.console
+            renderables = [console.render_str("\n[cyan]📊 Scan Results[/cyan]"), stats_table]
+            if lines:
+                renderables.append(console.render_str("\n".join(lines)))
+            console.print(rich.Group(*renderables))
         
         else:
             print(f"\nScan Results:")
@@ -582,32 +817,32 @@ For more information: https://github.com/trackergenai/envdoctor
                 readable_key = key.replace('_', ' ').title()
                 print(f"{readable_key}: {value}")
     
-    def _save_scan_results(self, result, filename: str, format_type: str):
+    def _save_scan_results(self, result, filename: str, format_type: str,
+                           unique_vars: Optional[Set[str]] = None,
+                           sorted_vars: Optional[List[str]] = None):
         """Save scan results to file"""
+        if unique_vars is None:
+            unique_vars = _unique_variable_names(result)
         
-        output_data = {
-            'statistics': result.usage_stats,
-            'variables_used': list(set(usage.variable_name for usage in result.usages)),
-            'system_variables_count': len(result.system_variables),
-            'file_variables': {k: list(v.keys()) for k, v in result.file_variables.items()},
-            'usage_details': [
-                {
-                    'variable': usage.variable_name,
-                    'file': usage.file_path,
-                    'line': usage.line_number,
-                    'method': usage.access_method
-                }
-                for usage in result.usages
-            ]
-        }
+        if format_type in ('json', 'yaml'):
+            output_data = {
+                'statistics': result.usage_stats,
+                'variables_used': list(unique_vars),
+                'system_variables_count': len(result.system_variables),
+                'file_variables': {k: list(v.keys()) for k, v in result.file_variables.items()},
+            }
         
         if format_type == 'json':
             import json
+            # The encoder streams to the file and converts one usage at a time
+            output_data['usage_details'] = result.usages
             with open(filename, 'w') as f:
-                json.dump(output_data, f, indent=2)
+                json.dump(output_data, f, indent=2, default=_json_default)
         
         elif format_type == 'yaml':
             import yaml
+            # PyYAML builds the whole node graph before emitting anyway
+            output_data['usage_details'] = [_usage_detail(usage) for usage in result.usages]
             with open(filename, 'w') as f:
                 yaml.dump(output_data, f, default_flow_style=False)
         
@@ -620,29 +855,28 @@ For more information: https://github.com/trackergenai/envdoctor
                 for key, value in result.usage_stats.items():
                     f.write(f"  {key.replace('_', ' ').title()}: {value}\n")
                 
-                f.write(f"\nVariables Used ({len(set(usage.variable_name for usage in result.usages))}):\n")
-                for var in sorted(set(usage.variable_name for usage in result.usages)):
+                f.write(f"\nVariables Used ({len(unique_vars)}):\n")
+                for var in (sorted_vars if sorted_vars is not None else sorted(unique_vars)):
                     f.write(f"  - {var}\n")
     
     def _show_system_variables(self):
         """Show system environment variables"""
-        system_vars = dict(os.environ)
+        # Sample straight from os.environ instead of copying it
+        total = len(os.environ)
         
         if RICH_AVAILABLE:
-            rprint(f"\n[green]🖥️ System Environment Variables ({len(system_vars)}):[/green]")
+            rprint(f"\n[green]🖥️ System Environment Variables ({total}):[/green]")
             
             # Show a sample of system variables  
-            sample_vars = list(system_vars.items())[:20]
-            for name, value in sample_vars:
+            for name, value in islice(os.environ.items(), 20):
                 preview = value[:50] + "..." if len(value) > 50 else value
                 rprint(f"   {name}: {preview}")
             
-            if len(system_vars) > 20:
-                rprint(f"   ... and {len(system_vars) - 20} more")
+            if total > 20:
+                rprint(f"   ... and {total - 20} more")
         else:
-            print(f"\nSystem Environment Variables ({len(system_vars)}):")
-            sample_vars = list(system_vars.items())[:10]
-            for name, value in sample_vars:
+            print(f"\nSystem Environment Variables ({total}):")
+            for name, value in islice(os.environ.items(), 10):
                 preview = value[:50] + "..." if len(value) > 50 else value
                 print(f"   {name}: {preview}")
     
@@ -650,23 +884,17 @@ For more information: https://github.com/trackergenai/envdoctor
         """Show file-based variables"""
         file_sources = [s for s in sources if s.type == 'file']
         
-        if RICH_AVAILABLE:
-            rprint(f"\n[yellow]📄 File-based Variables:[/yellow]")
-            for source in file_sources:
-                rprint(f"   {source.name}: {len(source.variables)} variables")
-        else:
-            print(f"\nFile-based Variables:")
-            for source in file_sources:
-                print(f"   {source.name}: {len(source.variables)} variables")
+        self.out.say(f"\n[yellow]📄 File-based Variables:[/yellow]", f"\nFile-based Variables:")
+        for source in file_sources:
+            line = f"   {source.name}: {len(source.variables)} variables"
+            self.out.say(line, line)
     
     def _show_sensitive_variables(self):
         """Show sensitive variables (with warning)"""
-        if RICH_AVAILABLE:
-            rprint(f"\n[red]🔒 Warning: Sensitive variables detected[/red]")
-            rprint(f"[dim]Use this information carefully and ensure proper security[/dim]")
-        else:
-            print(f"\nWarning: Sensitive variables detected")
-            print("Use this information carefully and ensure proper security")
+        self.out.say(f"\n[red]🔒 Warning: Sensitive variables detected[/red]",
+                     f"\nWarning: Sensitive variables detected")
+        self.out.say(f"[dim]Use this information carefully and ensure proper security[/dim]",
+                     "Use this information carefully and ensure proper security")
 
 
 def main():
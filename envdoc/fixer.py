@@ -3,31 +3,170 @@ Enhanced Environment Variable Fixer
 Applies fixes to code files and environment configuration with system integration
 """
 
-import ast
+import importlib.util
+import io
+import mmap
 import os
 import re
 import shutil
 import tempfile
+import tokenize
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, List, Set, Tuple, Optional, Any
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 import platform
 import subprocess
+import sys
 
-try:
-    from rich.console import Console
-    from rich.table import Table
-    from rich.panel import Panel
-    from rich import print as rprint
-    import questionary
-    INTERACTIVE_AVAILABLE = True
-except ImportError:
-    INTERACTIVE_AVAILABLE = False
-    Console = None
+# Rich, questionary and libcst are only imported once they are used,
+# so batch fixes and CLI start-up don't pay for them
+RICH_AVAILABLE = importlib.util.find_spec('rich') is not None
+INTERACTIVE_AVAILABLE = RICH_AVAILABLE and importlib.util.find_spec('questionary') is not None
+LIBCST_AVAILABLE = importlib.util.find_spec('libcst') is not None
+
+def rprint(*objects, **kwargs):
+    """Rich print, importing Rich on first use (plain print without Rich)"""
+    if RICH_AVAILABLE:
+        from rich import print as rich_print
+        rich_print(*objects, **kwargs)
+    else:
+        print(*objects, **kwargs)
 
 from .analyzer import EnhancedMismatch, EnhancedAnalysisResult
 from .scanner import EnvUsage
 
+# Accessors whose string-literal argument names an environment variable,
+# as (callable, opening bracket)
+_RENAME_PATTERNS = (
+    ("os.getenv", "("),         # os.getenv('OLD_NAME')
+    ("os.environ", "["),        # os.environ['OLD_NAME']
+    ("os.environ.get", "("),    # os.environ.get('OLD_NAME')
+    ("getenv", "("),            # getenv('OLD_NAME') (when imported directly)
+    ("environ", "["),           # environ['OLD_NAME'] (when imported directly)
+    ("get_env", "("),           # Custom env functions
+    ("env_var", "("),
+)
+# Whitespace never needs to be given back to match the bracket or quote after it,
+# so it is matched possessively where re supports that (3.11+)
+_SPACES = r"\s*+" if sys.version_info >= (3, 11) else r"\s*"
+_RENAME_PREFIX = "|".join(rf"{re.escape(func)}{_SPACES}{re.escape(bracket)}" for func, bracket in _RENAME_PATTERNS)
+_RENAME_CALLS = tuple(func for func, bracket in _RENAME_PATTERNS if bracket == "(")
+_RENAME_SUBSCRIPTS = tuple(func for func, bracket in _RENAME_PATTERNS if bracket == "[")
+# Letters that may precede the opening quote of a string literal token
+_STRING_PREFIX_CHARS = "bBfFrRuU"
+
+@lru_cache(maxsize=256)
+def _rename_regex(old_names: Tuple[str, ...]):
+    """Compiled pattern matching any accessor of any of old_names"""
+    names = "|".join(map(re.escape, old_names))
+    return re.compile(rf"((?:{_RENAME_PREFIX}){_SPACES}['\"])({names})(['\"])")
+
+def _fstring_fields(body: str, raw: bool) -> Optional[List[Tuple[int, int]]]:
+    """(start, end) spans of the replacement fields in an f-string body, or None if it cannot be split"""
+    fields = []
+    i, n = 0, len(body)
+    while i < n:
+        c = body[i]
+        if c == '\\' and not raw:
+            # \N{NAME} escapes are literal text, braces included
+            if body.startswith('N{', i + 1):
+                close = body.find('}', i + 3)
+                if close == -1:
+                    return None
+                i = close + 1
+            else:
+                i += 2
+            continue
+        if c not in '{}':
+            i += 1
+            continue
+        if body.startswith(c * 2, i):  # Escaped {{ or }}
+            i += 2
+            continue
+        if c == '}':
+            return None
+        
+        # Matching close brace, skipping brackets and string literals in the expression
+        depth, j, quote = 0, i, None
+        while j < n:
+            if quote:
+                if body.startswith(quote, j):
+                    j += len(quote)
+                    quote = None
+                else:
+                    j += 1
+                continue
+            ch = body[j]
+            if ch in '\'"':
+                quote = body[j:j + 3] if body[j:j + 3] in ('"""', "'''") else ch
+                j += len(quote)
+                continue
+            if ch in '([{':
+                depth += 1
+            elif ch in ')]}':
+                depth -= 1
+                if depth == 0:
+                    break
+            j += 1
+        else:
+            return None
+        fields.append((i, j + 1))
+        i = j + 1
+    return fields
+
+# Read/write buffer for rewritten source files
+_IO_BUFFER = 1 << 20
+
+# Text files a rename may rewrite (the scanner's code files plus common config);
+# bytecode, binaries and other assets are skipped without being opened
+_SRC_EXTS = frozenset({
+    '.py', '.pyx', '.pyi', '.sh', '.bash', '.zsh', '.js', '.ts',
+    '.json', '.yml', '.yaml', '.toml', '.ini', '.cfg', '.env',
+})
+_SRC_PREFIXES = ('Dockerfile', '.env')
+
+def _is_source_file(file_path: str) -> bool:
+    """Whether file_path looks like a text source/config file, judged by name alone"""
+    name = os.path.basename(file_path)
+    return os.path.splitext(name)[1] in _SRC_EXTS or name.startswith(_SRC_PREFIXES)
+
+@contextmanager
+def _atomic_open(file_path: str, newline: Optional[str] = None):
+    """Text handle on a sibling temp file that replaces file_path once writing succeeds"""
+    target = os.path.realpath(file_path)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(target), prefix='.envdoctor_')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8', buffering=_IO_BUFFER, newline=newline) as f:
+            yield f
+        if os.path.exists(target):
+            shutil.copymode(target, tmp_path)
+        os.replace(tmp_path, target)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+def _write_atomic(file_path: str, content: str):
+    """Write content to a sibling temp file, then swap it into place"""
+    with _atomic_open(file_path) as f:
+        f.write(content)
+
+@lru_cache(maxsize=None)
+def _setx_executable() -> str:
+    """Resolved path of Windows' setx, looked up once"""
+    return shutil.which("setx") or "setx"
+
+def _mentions_any(file_path: str, names) -> bool:
+    """Whether the file's raw bytes contain any of names, checked through mmap without decoding"""
+    with open(file_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return False  # Empty files cannot be mapped
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return any(mm.find(name.encode('utf-8')) != -1 for name in names)
+
 @dataclass
 class FixAction:
     """Represents a fixing action"""
@@ -40,6 +179,7 @@ class FixAction:
     system_command: Optional[str] = None
     value_to_set: Optional[str] = None
     backup_created: bool = False
+    backup_paths: List[str] = field(default_factory=list)
 
 @dataclass
 class FixResult:
@@ -60,9 +200,30 @@ class EnhancedEnvFixer:
     def __init__(self, project_root: str, dry_run: bool = False):
         self.project_root = Path(project_root)
         self.dry_run = dry_run
-        self.console = Console() if INTERACTIVE_AVAILABLE else None
+        self._console = None
         self.backups_dir = self.project_root / ".envdoctor_backups"
-        
+        # Timestamped directory holding the current batch's backups, and the file each backup is of
+        self._backup_dir: Optional[str] = None
+        self._backup_sources: Dict[str, str] = {}
+        self._system = platform.system()
+        # Windows setx command (persistent); on Unix-like systems the export goes in the shell profile
+        self._set_template = 'setx {name} "{value}"' if self._system == "Windows" else 'export {name}="{value}"'
+        self._root_prefix = os.path.join(str(self.project_root), '')
+        self._abs_root = os.path.abspath(str(self.project_root))
+        # Plain string paths built once, reused per file and per action
+        self._backups_dir = str(self.backups_dir)
+        self._env_file = os.path.join(str(self.project_root), ".env")
+        # Progress lines buffered while actions are applied (None: print directly)
+        self._log: Optional[List[str]] = None
+        
+    @property
+    def console(self):
+        """Rich console, created on first use (None without the interactive extras)"""
+        if self._console is None and INTERACTIVE_AVAILABLE:
+            from rich.console import Console
+            self._console = Console()
+        return self._console
+    
     def interactive_fix(self, analysis_result: EnhancedAnalysisResult) -> FixResult:
         """Interactive fixing with user choices for each issue"""
         
@@ -70,6 +231,8 @@ class EnhancedEnvFixer:
             rprint("[red]❌ Interactive mode requires 'rich' and 'questionary' packages[/red]")
             return FixResult([], [], [], ["Interactive mode not available"], 0, 0)
         
+        import questionary
+        
         rprint(f"[bold blue]🔧 EnvDoctor Interactive Fix Mode[/bold blue]")
         rprint(f"Project: {self.project_root}")
         rprint(f"Dry Run: {'Yes' if self.dry_run else 'No'}")
@@ -111,6 +274,7 @@ class EnhancedEnvFixer:
     
     def _get_user_action_for_mismatch(self, mismatch: EnhancedMismatch) -> Optional[FixAction]:
         """Get user's preferred action for a specific mismatch"""
+        import questionary
         
         rprint(f"[red]❌ Variable: {mismatch.used_name}[/red]")
         rprint(f"   Issue: {mismatch.issue_type}")
@@ -118,7 +282,7 @@ class EnhancedEnvFixer:
         
         # Show usage locations
         for usage in mismatch.usages[:3]:  # Show first 3
-            file_path = Path(usage.file_path).relative_to(self.project_root)
+            file_path = self._relative_path(usage.file_path)
             rprint(f"     📄 {file_path}:{usage.line_number}")
         if len(mismatch.usages) > 3:
             rprint(f"     ... and {len(mismatch.usages) - 3} more locations")
@@ -137,7 +301,7 @@ class EnhancedEnvFixer:
         choices.append(f"Add '{mismatch.used_name}' to .env file")
         
         # Option 3: Set as system environment variable
-        if platform.system() in ['Windows', 'Linux', 'Darwin']:
+        if self._system in ['Windows', 'Linux', 'Darwin']:
             choices.append(f"Set '{mismatch.used_name}' as system environment variable")
         
         # Option 4: Manual rename
@@ -181,7 +345,7 @@ class EnhancedEnvFixer:
                 old_name=mismatch.used_name,
                 new_name=mismatch.used_name,
                 target_files=[],
-                env_files_to_update=[str(self.project_root / ".env")],
+                env_files_to_update=[self._env_file],
                 value_to_set=value
             )
         
@@ -222,15 +386,28 @@ class EnhancedEnvFixer:
         
         return None
     
+    def _relative_path(self, file_path: str) -> str:
+        """File path relative to the project root, for display"""
+        if file_path.startswith(self._root_prefix):
+            return file_path[len(self._root_prefix):]
+        return file_path
+    
     def _get_system_set_command(self, var_name: str, value: str) -> str:
         """Get the command to set system environment variable"""
-        
-        if platform.system() == "Windows":
-            # Windows setx command (persistent)
-            return f'setx {var_name} "{value}"'
+        return self._set_template.format(name=var_name, value=value)
+    
+    def _emit(self, message: str):
+        """Print a progress line, or buffer it while actions are being applied"""
+        if self._log is not None:
+            self._log.append(message)
         else:
-            # Unix-like systems - this would go in shell profile
-            return f'export {var_name}="{value}"'
+            rprint(message)
+    
+    def _flush_log(self):
+        """Print the buffered progress lines in one call"""
+        if self._log:
+            rprint("\n".join(self._log))
+        self._log = None
     
     def _apply_actions(self, actions: List[FixAction]) -> FixResult:
         """Apply the list of fix actions"""
@@ -238,40 +415,49 @@ class EnhancedEnvFixer:
         rprint(f"\n[cyan]🔧 Applying {len(actions)} fix actions...[/cyan]")
         
         applied_actions = []
-        modified_files = []
-        backups_created = []
+        modified_files: Dict[str, None] = {}  # Insertion-ordered set
+        backups_created: Dict[str, None] = {}
         errors = []
         
-        # Ensure backups directory exists
+        # Ensure backups directory exists; every backup in the batch goes under one timestamped directory
         if not self.dry_run:
             self.backups_dir.mkdir(exist_ok=True)
+        self._start_backup_batch()
         
-        for i, action in enumerate(actions, 1):
-            rprint(f"\n[dim]Action {i}/{len(actions)}:[/dim] {action.action_type}: {action.old_name} → {action.new_name}")
-            
-            try:
-                success = self._apply_single_action(action)
-                if success:
-                    applied_actions.append(action)
-                    if action.target_files:
-                        modified_files.extend(action.target_files)
-                    if action.env_files_to_update:
-                        modified_files.extend(action.env_files_to_update)
-                    if action.backup_created:
-                        backups_created.extend(self._get_backup_files_for_action(action))
-                    rprint(f"   [green]✅ Success[/green]")
-                else:
-                    errors.append(f"Failed to apply action: {action.action_type} for {action.old_name}")
-                    rprint(f"   [red]❌ Failed[/red]")
+        # Per-file and per-action lines are printed together once the actions are done
+        self._log = []
+        try:
+            # Code renames are grouped so each file is read and written once,
+            # and all .env additions go out in a single append
+            renamed_in = None if self.dry_run else self._rename_in_files(actions)
+            env_written = None if self.dry_run else self._append_to_env_file(actions)
             
-            except Exception as e:
-                error_msg = f"Error applying {action.action_type} for {action.old_name}: {str(e)}"
-                errors.append(error_msg)
-                rprint(f"   [red]❌ Error: {str(e)}[/red]")
+            for i, action in enumerate(actions, 1):
+                self._emit(f"\n[dim]Action {i}/{len(actions)}:[/dim] {action.action_type}: {action.old_name} → {action.new_name}")
+                
+                try:
+                    success = self._apply_single_action(action, renamed_in, env_written)
+                    if success:
+                        applied_actions.append(action)
+                        if action.target_files:
+                            modified_files.update(dict.fromkeys(action.target_files))
+                        if action.env_files_to_update:
+                            modified_files.update(dict.fromkeys(action.env_files_to_update))
+                        backups_created.update(dict.fromkeys(action.backup_paths))
+                        self._emit(f"   [green]✅ Success[/green]")
+                    else:
+                        errors.append(f"Failed to apply action: {action.action_type} for {action.old_name}")
+                        self._emit(f"   [red]❌ Failed[/red]")
+                
+                except Exception as e:
+                    error_msg = f"Error applying {action.action_type} for {action.old_name}: {str(e)}"
+                    errors.append(error_msg)
+                    self._emit(f"   [red]❌ Error: {str(e)}[/red]")
+        finally:
+            self._flush_log()
         
-        # Remove duplicates
-        modified_files = list(set(modified_files))
-        backups_created = list(set(backups_created))
+        modified_files = list(modified_files)
+        backups_created = list(backups_created)
         
         success_count = len(applied_actions)
         total_count = len(actions)
@@ -297,246 +483,408 @@ class EnhancedEnvFixer:
             total_count=total_count
         )
     
-    def _apply_single_action(self, action: FixAction) -> bool:
+    def _apply_single_action(self, action: FixAction,
+                             renamed_in: Optional[Dict[str, Dict[str, str]]] = None,
+                             env_written: Optional[bool] = None) -> bool:
         """Apply a single fix action"""
         
         if self.dry_run:
-            rprint(f"   [dim](DRY RUN) Would apply: {action.action_type}[/dim]")
+            self._emit(f"   [dim](DRY RUN) Would apply: {action.action_type}[/dim]")
             return True
         
         try:
             if action.action_type == 'rename_in_code':
-                return self._rename_in_code_files(action)
+                return self._rename_in_code_files(action, renamed_in)
             elif action.action_type == 'add_to_env':
-                return self._add_to_env_file(action)
+                return self._add_to_env_file(action, env_written)
             elif action.action_type == 'use_system_var':
                 return self._set_system_variable(action)
             else:
-                rprint(f"   [red]Unknown action type: {action.action_type}[/red]")
+                self._emit(f"   [red]Unknown action type: {action.action_type}[/red]")
                 return False
         
         except Exception as e:
-            rprint(f"   [red]Exception in {action.action_type}: {str(e)}[/red]")
+            self._emit(f"   [red]Exception in {action.action_type}: {str(e)}[/red]")
             return False
     
-    def _rename_in_code_files(self, action: FixAction) -> bool:
+    def _rename_in_files(self, actions: List[FixAction]) -> Dict[str, Dict[str, str]]:
+        """Apply all code renames with one pass per file, returning the renames made in each file"""
+        
+        # Bucket renames by file; the first action renaming a name wins
+        renames_by_file: Dict[str, Dict[str, str]] = {}
+        for action in actions:
+            if action.action_type == 'rename_in_code':
+                for file_path in action.target_files:
+                    renames_by_file.setdefault(file_path, {}).setdefault(action.old_name, action.new_name)
+        
+        renamed_in = {}
+        backups = {}
+        
+        # Create backups up front, so files sharing a name never write the same backup concurrently
+        for file_path in renames_by_file:
+            backup_path = self._create_backup(file_path)
+            if backup_path:
+                backups[file_path] = backup_path
+        
+        # Modify the files; each is independent and I/O-bound, so they run on a thread pool
+        workers = min(len(renames_by_file), 32, (os.cpu_count() or 1) * 4) or 1
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                file_path: executor.submit(self._rename_variables_in_file, file_path, renames)
+                for file_path, renames in renames_by_file.items()
+            }
+            for file_path, future in futures.items():
+                try:
+                    renamed_in[file_path] = future.result()
+                except Exception as e:
+                    self._emit(f"      ❌ Error modifying {file_path}: {str(e)}")
+        
+        for action in actions:
+            if action.action_type == 'rename_in_code':
+                action.backup_paths.extend(
+                    backups[file_path] for file_path in dict.fromkeys(action.target_files) if file_path in backups
+                )
+                action.backup_created = bool(action.backup_paths)
+        
+        return renamed_in
+    
+    def _rename_in_code_files(self, action: FixAction,
+                              renamed_in: Optional[Dict[str, Dict[str, str]]] = None) -> bool:
         """Rename variable in code files"""
         success = True
         
+        if renamed_in is None:
+            renamed_in = self._rename_in_files([action])
+        
         # Get unique files to modify
-        files_to_modify = list(set(action.target_files))
+        files_to_modify = list(dict.fromkeys(action.target_files))
         
         for file_path in files_to_modify:
-            try:
-                # Create backup
-                backup_path = self._create_backup(file_path)
-                if backup_path:
-                    action.backup_created = True
-                
-                # Modify the file
-                if self._rename_variable_in_file(file_path, action.old_name, action.new_name):
-                    rprint(f"      📝 Modified: {Path(file_path).relative_to(self.project_root)}")
-                else:
-                    success = False
-                    rprint(f"      ⚠️ No changes made to: {Path(file_path).relative_to(self.project_root)}")
-            
-            except Exception as e:
-                rprint(f"      ❌ Error modifying {file_path}: {str(e)}")
+            if file_path not in renamed_in:
+                # The error was reported when the file was processed
+                success = False
+            elif renamed_in[file_path].get(action.old_name) == action.new_name:
+                self._emit(f"      📝 Modified: {self._relative_path(file_path)}")
+            else:
                 success = False
+                self._emit(f"      ⚠️ No changes made to: {self._relative_path(file_path)}")
         
         return success
     
-    def _add_to_env_file(self, action: FixAction) -> bool:
-        """Add variable to .env file"""
+    def _append_to_env_file(self, actions: List[FixAction]) -> Optional[bool]:
+        """Add the variables of all add_to_env actions to .env in one rewrite; None if there are none"""
+        
+        env_actions = [action for action in actions if action.action_type == 'add_to_env']
+        if not env_actions:
+            return None
         
-        env_file = self.project_root / ".env"
+        env_file = self._env_file
+        env_exists = os.path.exists(env_file)
         
-        # Create backup
-        if env_file.exists():
-            backup_path = self._create_backup(str(env_file))
+        # Create backup, once for the whole batch
+        if env_exists:
+            backup_path = self._create_backup(env_file)
             if backup_path:
-                action.backup_created = True
+                for action in env_actions:
+                    action.backup_paths.append(backup_path)
+                    action.backup_created = True
         
-        # Add variable to .env file
+        # Add variables to .env file, streaming it through a temp file: existing
+        # definitions are updated in place and the rest are appended. Line endings
+        # are passed through untranslated so untouched lines stay byte-identical
+        pending = {action.new_name: action.value_to_set or '' for action in env_actions}
         try:
-            with open(env_file, 'a', encoding='utf-8') as f:
-                f.write(f"\n# Added by EnvDoctor\n")
-                f.write(f"{action.new_name}={action.value_to_set or ''}\n")
-            
-            rprint(f"      📄 Added to .env: {action.new_name}")
+            with _atomic_open(env_file, newline='') as out:
+                if env_exists:
+                    with open(env_file, 'r', encoding='utf-8', buffering=_IO_BUFFER, newline='') as source:
+                        for line in source:
+                            out.write(self._update_env_line(line, pending))
+                out.write("".join(
+                    f"{os.linesep}# Added by EnvDoctor{os.linesep}{name}={value}{os.linesep}"
+                    for name, value in pending.items()
+                ))
             return True
         
         except Exception as e:
-            rprint(f"      ❌ Error writing to .env file: {str(e)}")
+            self._emit(f"      ❌ Error writing to .env file: {str(e)}")
             return False
     
+    @staticmethod
+    def _update_env_line(line: str, pending: Dict[str, str]) -> str:
+        """Rewrite a .env line defining a pending variable, keeping its line ending and removing it from pending"""
+        stripped = line.strip()
+        if stripped and not stripped.startswith('#') and '=' in stripped:
+            key = stripped.split('=', 1)[0].strip()
+            if key in pending:
+                ending = line[len(line.rstrip('\r\n')):] or os.linesep
+                return f"{key}={pending.pop(key)}{ending}"
+        return line
+    
+    def _add_to_env_file(self, action: FixAction, env_written: Optional[bool] = None) -> bool:
+        """Add variable to .env file"""
+        
+        if env_written is None:
+            env_written = self._append_to_env_file([action])
+        
+        if env_written:
+            self._emit(f"      📄 Added to .env: {action.new_name}")
+        return bool(env_written)
+    
     def _set_system_variable(self, action: FixAction) -> bool:
         """Set system environment variable"""
         
         if not action.system_command:
-            rprint(f"      ⚠️ No system command for {action.new_name}")
+            self._emit(f"      ⚠️ No system command for {action.new_name}")
             return False
         
         try:
-            if platform.system() == "Windows":
-                # Use setx for persistent variables on Windows
+            if self._system == "Windows":
+                # Use setx for persistent variables on Windows, run directly rather than through cmd.exe
                 result = subprocess.run(
-                    action.system_command,
-                    shell=True,
+                    [_setx_executable(), action.new_name, action.value_to_set or ''],
                     capture_output=True,
                     text=True,
-                    timeout=10
+                    timeout=10,
+                    creationflags=getattr(subprocess, 'CREATE_NO_WINDOW', 0)
                 )
                 
                 if result.returncode == 0:
-                    rprint(f"      🖥️ Set system variable: {action.new_name}")
-                    rprint(f"      ⚠️ Note: Restart your terminal for changes to take effect")
+                    self._emit(f"      🖥️ Set system variable: {action.new_name}")
+                    self._emit(f"      ⚠️ Note: Restart your terminal for changes to take effect")
                     return True
                 else:
-                    rprint(f"      ❌ Failed to set system variable: {result.stderr}")
+                    self._emit(f"      ❌ Failed to set system variable: {result.stderr}")
                     return False
             
             else:
                 # Unix-like systems - add to current process and suggest shell profile update
+                from .manager import _invalidate_environ
                 os.environ[action.new_name] = action.value_to_set or ''
-                rprint(f"      🖥️ Set in current session: {action.new_name}")
-                rprint(f"      💡 Consider adding '{action.system_command}' to your shell profile")
+                _invalidate_environ()
+                self._emit(f"      🖥️ Set in current session: {action.new_name}")
+                self._emit(f"      💡 Consider adding '{action.system_command}' to your shell profile")
                 return True
         
         except subprocess.TimeoutExpired:
-            rprint(f"      ⚠️ Timeout setting system variable: {action.new_name}")
+            self._emit(f"      ⚠️ Timeout setting system variable: {action.new_name}")
             return False
         except Exception as e:
-            rprint(f"      ❌ Error setting system variable: {str(e)}")
+            self._emit(f"      ❌ Error setting system variable: {str(e)}")
             return False
     
-    def _rename_variable_in_file(self, file_path: str, old_name: str, new_name: str) -> bool:
-        """Rename environment variable in a specific file"""
+    def _rename_variables_in_file(self, file_path: str, renames: Dict[str, str]) -> Dict[str, str]:
+        """Rename environment variables in a specific file, returning the renames made"""
+        
+        if not _is_source_file(file_path):
+            return {}
         
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
+            # Nothing to decode, parse or scan if no old name appears at all
+            if not _mentions_any(file_path, renames):
+                return {}
+            
+            with open(file_path, 'r', encoding='utf-8', buffering=_IO_BUFFER) as f:
                 content = f.read()
             
             original_content = content
+            renamed = {}
             
-            # Python files: Try AST-based replacement first
+            # Python files: rename through the syntax tree (or, without libcst, the
+            # token stream), keeping comments and formatting
+            updated = None
             if file_path.endswith('.py'):
-                content = self._rename_with_ast(content, old_name, new_name, file_path)
+                if LIBCST_AVAILABLE:
+                    updated = self._rename_with_cst(content, renames, renamed)
+                else:
+                    updated = self._rename_with_tokenize(content, renames, renamed)
             
-            # Fallback to regex replacement for all files
-            if content == original_content:
-                content = self._rename_with_regex(content, old_name, new_name)
+            # Regex replacement for other files and for Python that does not parse
+            if updated is None:
+                updated = self._rename_with_regex(content, renames, renamed)
+            content = updated
             
             # Only write if changes were made
             if content != original_content:
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(content)
-                return True
+                _write_atomic(file_path, content)
             
-            return False
+            return renamed
         
         except Exception as e:
-            rprint(f"      ❌ Error processing {file_path}: {str(e)}")
-            return False
+            self._emit(f"      ❌ Error processing {file_path}: {str(e)}")
+            return {}
     
-    def _rename_with_ast(self, content: str, old_name: str, new_name: str, file_path: str) -> str:
-        """Use AST to rename variables in Python files"""
+    def _rename_with_cst(self, content: str, renames: Dict[str, str],
+                         renamed: Optional[Dict[str, str]] = None) -> Optional[str]:
+        """Use libcst to rename variables in Python files; None if the code does not parse"""
+        
+        import libcst as cst
         
         try:
-            tree = ast.parse(content)
-            transformer = VariableRenameTransformer(old_name, new_name)
-            new_tree = transformer.visit(tree)
-            
-            if transformer.changes_made:
-                # Convert back to code
-                import ast
-                try:
-                    # Try to use astunparse if available
-                    import astunparse
-                    return astunparse.unparse(new_tree)
-                except ImportError:
-                    # Fallback: use regex replacement
-                    return self._rename_with_regex(content, old_name, new_name)
-        
-        except SyntaxError:
-            # If AST parsing fails, fall back to regex
-            pass
-        
-        return content
-    
-    def _rename_with_regex(self, content: str, old_name: str, new_name: str) -> str:
-        """Use regex to rename variables"""
-        
-        # Patterns for different usage contexts
-        patterns = [
-            # os.getenv('OLD_NAME') -> os.getenv('NEW_NAME')
-            (rf"(os\.getenv\s*\(\s*['\"])({re.escape(old_name)})(['\"])", rf"\1{new_name}\3"),
-            
-            # os.environ['OLD_NAME'] -> os.environ['NEW_NAME']
-            (rf"(os\.environ\s*\[\s*['\"])({re.escape(old_name)})(['\"])", rf"\1{new_name}\3"),
-            
-            # os.environ.get('OLD_NAME') -> os.environ.get('NEW_NAME')
-            (rf"(os\.environ\.get\s*\(\s*['\"])({re.escape(old_name)})(['\"])", rf"\1{new_name}\3"),
-            
-            # getenv('OLD_NAME') -> getenv('NEW_NAME') (when imported directly)
-            (rf"(getenv\s*\(\s*['\"])({re.escape(old_name)})(['\"])", rf"\1{new_name}\3"),
+            module = cst.parse_module(content)
+        except cst.ParserSyntaxError:
+            return None
+        
+        transformer = _transformer_class()(renames)
+        new_module = module.visit(transformer)
+        
+        if renamed is not None:
+            renamed.update(transformer.renamed)
+        return new_module.code
+    
+    def _rename_with_tokenize(self, content: str, renames: Dict[str, str],
+                              renamed: Optional[Dict[str, str]] = None) -> Optional[str]:
+        """Use tokenize to rename variables in Python files; None if the code does not tokenize"""
+        
+        try:
+            tokens = [
+                tok for tok in tokenize.generate_tokens(io.StringIO(content).readline)
+                if tok.type not in (tokenize.NL, tokenize.COMMENT)
+            ]
+        except (tokenize.TokenError, SyntaxError):
+            return None
+        
+        # Older tokenizers report stray characters and unterminated strings as tokens
+        if any(tok.type == tokenize.ERRORTOKEN for tok in tokens):
+            return None
+        
+        # Character offset of each (1-based) token row
+        line_starts = [0, 0]
+        for line in io.StringIO(content):
+            line_starts.append(line_starts[-1] + len(line))
+        
+        pieces = []
+        last_end = 0
+        
+        for i, tok in enumerate(tokens):
+            if tok.type != tokenize.STRING:
+                continue
             
-            # environ['OLD_NAME'] -> environ['NEW_NAME'] (when imported directly)
-            (rf"(environ\s*\[\s*['\"])({re.escape(old_name)})(['\"])", rf"\1{new_name}\3"),
+            if tok.string[0] not in "'\"":
+                # Before Python 3.12 an f-string is a single token; rename the accessors
+                # in its replacement fields as the regex fallback does, never in its literal text
+                string = tok.string
+                prefix = string[:len(string) - len(string.lstrip(_STRING_PREFIX_CHARS))].lower()
+                if 'f' not in prefix:
+                    continue
+                quote_len = 3 if string[len(prefix):len(prefix) + 3] in ('"""', "'''") else 1
+                body_start = len(prefix) + quote_len
+                fields = _fstring_fields(string[body_start:-quote_len], 'r' in prefix)
+                if not fields:
+                    continue
+                parts = []
+                last = 0
+                for start, end in fields:
+                    start += body_start
+                    end += body_start
+                    parts.append(string[last:start])
+                    parts.append(self._rename_with_regex(string[start:end], renames, renamed))
+                    last = end
+                parts.append(string[last:])
+                replacement = "".join(parts)
+                if replacement == string:
+                    continue
+            else:
+                # Looking for ACCESSOR ( 'OLD' [,)]  or  ACCESSOR [ 'OLD' ]
+                if i < 2:
+                    continue
+                new_name = renames.get(tok.string[1:-1])
+                bracket, after = tokens[i - 1].string, tokens[i + 1].string
+                if (new_name is None or new_name == tok.string[1:-1] or
+                        not ((bracket == "(" and after in (",", ")")) or (bracket == "[" and after == "]"))):
+                    continue
+                
+                # Dotted name in front of the bracket
+                j = i - 2
+                if tokens[j].type != tokenize.NAME:
+                    continue
+                while j >= 2 and tokens[j - 1].string == "." and tokens[j - 2].type == tokenize.NAME:
+                    j -= 2
+                name = "".join(t.string for t in tokens[j:i - 1])
+                accessors = _RENAME_CALLS if bracket == "(" else _RENAME_SUBSCRIPTS
+                if not any(name == a or name.endswith("." + a) for a in accessors):
+                    continue
+                
+                replacement = tok.string[0] + new_name + tok.string[-1]
+                if renamed is not None:
+                    renamed[tok.string[1:-1]] = new_name
             
-            # Custom env functions
-            (rf"(get_env\s*\(\s*['\"])({re.escape(old_name)})(['\"])", rf"\1{new_name}\3"),
-            (rf"(env_var\s*\(\s*['\"])({re.escape(old_name)})(['\"])", rf"\1{new_name}\3"),
-        ]
+            start = line_starts[tok.start[0]] + tok.start[1]
+            pieces.append(content[last_end:start])
+            pieces.append(replacement)
+            last_end = start + len(tok.string)
         
-        modified_content = content
-        
-        for pattern, replacement in patterns:
-            modified_content = re.sub(pattern, replacement, modified_content)
+        pieces.append(content[last_end:])
+        return "".join(pieces)
+    
+    def _rename_with_regex(self, content: str, renames: Dict[str, str],
+                           renamed: Optional[Dict[str, str]] = None) -> str:
+        """Use regex to rename variables, recording the renames made in renamed"""
+        
+        def replace(match):
+            old_name = match.group(2)
+            new_name = renames[old_name]
+            if renamed is not None and new_name != old_name:
+                renamed[old_name] = new_name
+            return match.group(1) + new_name + match.group(3)
+        
+        # One pass over the content covers every accessor pattern and name
+        return _rename_regex(tuple(renames)).sub(replace, content)
+    
+    def _start_backup_batch(self):
+        """Pick a timestamped backup directory no earlier batch has used"""
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        backup_dir = os.path.join(self._backups_dir, stamp)
+        suffix = 1
+        while os.path.exists(backup_dir):
+            suffix += 1
+            backup_dir = os.path.join(self._backups_dir, f"{stamp}_{suffix}")
+        self._backup_dir = backup_dir
+        self._backup_sources = {}
+    
+    def _backup_path(self, file_path: str) -> str:
+        """Backup location for a file: its project-relative path under the batch's backup directory"""
+        if self._backup_dir is None:
+            self._start_backup_batch()
         
-        return modified_content
+        abs_path = os.path.abspath(file_path)
+        try:
+            rel_path = os.path.relpath(abs_path, self._abs_root)
+        except ValueError:  # on another drive
+            rel_path = os.pardir
+        if rel_path == os.pardir or rel_path.startswith(os.pardir + os.sep):
+            # Outside the project: mirror the absolute path, so distinct files still get distinct backups
+            drive, path = os.path.splitdrive(abs_path)
+            rel_path = os.path.join('_external', drive.strip(':\\/'), path.lstrip('\\/'))
+        
+        # The suffix keeps backed-up sources from matching the scanner's code globs
+        return os.path.join(self._backup_dir, rel_path + '.backup')
     
     def _create_backup(self, file_path: str) -> Optional[str]:
-        """Create backup of a file"""
+        """Create backup of a file, once per batch"""
         
         try:
-            source_path = Path(file_path)
-            if not source_path.exists():
+            if not os.path.exists(file_path):
                 return None
             
-            # Create backup filename with timestamp
-            from datetime import datetime
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            backup_name = f"{source_path.name}.backup_{timestamp}"
-            backup_path = self.backups_dir / backup_name
+            backup_path = self._backup_path(file_path)
+            source = os.path.abspath(file_path)
+            backed_up = self._backup_sources.get(backup_path)
+            if backed_up == source:
+                # Keep the copy taken before this batch first changed the file
+                return backup_path
+            if backed_up is not None:
+                raise ValueError(f"backup {backup_path} already holds {backed_up}")
             
-            # Copy the file
-            shutil.copy2(source_path, backup_path)
-            return str(backup_path)
+            # Copy the file contents only; copyfile uses the platform's fast copy path
+            os.makedirs(os.path.dirname(backup_path), exist_ok=True)
+            shutil.copyfile(file_path, backup_path)
+            self._backup_sources[backup_path] = source
+            return backup_path
         
         except Exception as e:
-            rprint(f"      ⚠️ Could not create backup for {file_path}: {str(e)}")
+            self._emit(f"      ⚠️ Could not create backup for {file_path}: {str(e)}")
             return None
     
-    def _get_backup_files_for_action(self, action: FixAction) -> List[str]:
-        """Get list of backup files that might have been created for an action"""
-        
-        # This is a simplified implementation
-        # In practice, you'd track which backups were actually created
-        backup_files = []
-        
-        if action.backup_created:
-            from datetime import datetime
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            
-            # Add potential backup files
-            for file_path in action.target_files + action.env_files_to_update:
-                source_path = Path(file_path)
-                backup_name = f"{source_path.name}.backup_{timestamp}"
-                backup_files.append(str(self.backups_dir / backup_name))
-        
-        return backup_files
-    
     def batch_fix(self, analysis_result: EnhancedAnalysisResult, 
                   auto_apply_confidence_threshold: float = 0.9) -> FixResult:
         """Automatically fix issues with high confidence"""
@@ -574,37 +922,90 @@ class EnhancedEnvFixer:
             return FixResult([], [], [], [], 0, 0)
 
 
-class VariableRenameTransformer(ast.NodeTransformer):
-    """AST transformer to rename environment variables in Python code"""
+@lru_cache(maxsize=None)
+def _transformer_class():
+    """Define VariableRenameTransformer on first use, importing libcst only then"""
+    import libcst as cst
+    from libcst.helpers import get_full_name_for_node
     
-    def __init__(self, old_name: str, new_name: str):
-        self.old_name = old_name
-        self.new_name = new_name
-        self.changes_made = False
+    SimpleString = cst.SimpleString
+    Index = cst.Index
     
-    def visit_Call(self, node: ast.Call) -> ast.Call:
-        """Transform function calls that access environment variables"""
-        
-        # Handle os.getenv(), os.environ.get()
-        if (isinstance(node.func, ast.Attribute) and
-            node.args and isinstance(node.args[0], ast.Constant) and
-            node.args[0].value == self.old_name):
-            
-            node.args[0] = ast.Constant(value=self.new_name)
-            self.changes_made = True
-        
-        return self.generic_visit(node)
+    def _is_accessor(node, accessors: Tuple[str, ...]) -> bool:
+        """Whether node names one of accessors, possibly behind a module or object prefix"""
+        name = get_full_name_for_node(node)
+        return name is not None and any(name == a or name.endswith("." + a) for a in accessors)
     
-    def visit_Subscript(self, node: ast.Subscript) -> ast.Subscript:
-        """Transform subscript access like os.environ['KEY']"""
+    class VariableRenameTransformer(cst.CSTTransformer):
+        """libcst transformer to rename environment variables in Python code"""
+        
+        def __init__(self, rename_map: Dict[str, str]):
+            super().__init__()
+            self.rename_map = rename_map
+            self.renamed: Dict[str, str] = {}
+        
+        @property
+        def changes_made(self) -> bool:
+            """Whether any variable was renamed"""
+            return bool(self.renamed)
+        
+        def _rename_literal(self, node):
+            """Renamed copy of a plain string literal naming a variable, or None"""
+            # Exact type checks; libcst node classes are final
+            if type(node) is not SimpleString:
+                return None
+            value = node.value
+            if value[0] not in "'\"":
+                return None
+            
+            old_name = value[1:-1]
+            new_name = self.rename_map.get(old_name)
+            if new_name is None or new_name == old_name:
+                return None
+            
+            self.renamed[old_name] = new_name
+            return node.with_changes(value=value[0] + new_name + value[-1])
         
-        if (isinstance(node.slice, ast.Constant) and
-            node.slice.value == self.old_name):
+        def leave_Call(self, original_node, updated_node):
+            """Transform function calls that access environment variables"""
+            
+            # Handle os.getenv(), os.environ.get() and friends
+            args = updated_node.args
+            if args and _is_accessor(updated_node.func, _RENAME_CALLS):
+                arg = args[0]
+                if arg.keyword is None and not arg.star:
+                    new_value = self._rename_literal(arg.value)
+                    if new_value is not None:
+                        return updated_node.with_changes(
+                            args=(arg.with_changes(value=new_value), *args[1:])
+                        )
             
-            node.slice = ast.Constant(value=self.new_name)
-            self.changes_made = True
+            return updated_node
         
-        return self.generic_visit(node)
+        def leave_Subscript(self, original_node, updated_node):
+            """Transform subscript access like os.environ['KEY']"""
+            
+            elements = updated_node.slice
+            if len(elements) == 1 and _is_accessor(updated_node.value, _RENAME_SUBSCRIPTS):
+                element = elements[0]
+                index = element.slice
+                if type(index) is Index:
+                    new_value = self._rename_literal(index.value)
+                    if new_value is not None:
+                        return updated_node.with_changes(
+                            slice=(element.with_changes(slice=index.with_changes(value=new_value)),)
+                        )
+            
+            return updated_node
+    
+    VariableRenameTransformer.__qualname__ = "VariableRenameTransformer"
+    return VariableRenameTransformer
+
+def __getattr__(name: str):
+    """Expose VariableRenameTransformer lazily, since it needs libcst"""
+    if name == "VariableRenameTransformer" and LIBCST_AVAILABLE:
+        return _transformer_class()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 if __name__ == "__main__":
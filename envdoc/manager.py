@@ -7,39 +7,141 @@ Handles complete environment variable lifecycle management including:
 - Interactive management options
 """
 
+import importlib.util
 import os
+import re
 import sys
+import mmap
 import shutil
+import types
 from pathlib import Path
-from typing import Dict, List, Set, Optional, Any, Tuple
+from typing import Dict, List, Set, Optional, Any, Tuple, Mapping, Iterator
 from dataclasses import dataclass
 import subprocess
 import platform
+from functools import lru_cache
+from itertools import islice
+from operator import attrgetter
 
-try:
-    from rich.console import Console
-    from rich.table import Table
-    from rich.panel import Panel
-    from rich import print as rprint
-    import questionary
-    INTERACTIVE_AVAILABLE = True
-except ImportError:
-    INTERACTIVE_AVAILABLE = False
-    Console = None
+# Rich and questionary are only imported once an interactive or display path runs,
+# so CLI start-up doesn't pay for them
+RICH_AVAILABLE = importlib.util.find_spec('rich') is not None
+INTERACTIVE_AVAILABLE = RICH_AVAILABLE and importlib.util.find_spec('questionary') is not None
+
+def rprint(*objects, **kwargs):
+    """Rich print, importing Rich on first use (plain print without Rich)"""
+    if RICH_AVAILABLE:
+        from rich import print as rich_print
+        rich_print(*objects, **kwargs)
+    else:
+        print(*objects, **kwargs)
 
 from dotenv import load_dotenv
+from dotenv.main import DotEnv
+
+# One line of a plain ASCII env file: blank, comment, or KEY=value with an
+# unquoted value not starting with '#' or a quoted one without escapes.
+# Anything else goes to python-dotenv, whose rules for those vary by version.
+_ENV_LINE_RE = re.compile(
+    rb"[ \t]*(?:#[\t\x20-\x7e]*"
+    rb"|(?:export[ \t]+|(?!export[ \t]))([A-Za-z_][A-Za-z0-9_.-]*)[ \t]*=[ \t]*"
+    rb"(?:\"([\t\x20\x21\x23-\x5b\x5d-\x7e]*)\"[ \t]*(?:#[\t\x20-\x7e]*)?"
+    rb"|'([\t\x20-\x26\x28-\x5b\x5d-\x7e]*)'[ \t]*(?:#[\t\x20-\x7e]*)?"
+    rb"|([\x21\x24-\x26\x28-\x7e][\t\x20-\x7e]*)?))?"
+    rb"(?:\r\n|\n|\r|\Z)"
+)
+_INLINE_COMMENT_RE = re.compile(rb"[ \t]+#.*")
+
+# Smaller files are not worth mapping
+_MMAP_MIN_SIZE = 4096
+
+def _parse_plain_env(data) -> Optional[Dict[str, str]]:
+    """Variables of a plain env file in one regex scan, or None if any line needs python-dotenv"""
+    variables = {}
+    position = 0
+    for match in _ENV_LINE_RE.finditer(data):
+        if match.start() != position:
+            return None
+        position = match.end()
+        
+        key, double_quoted, single_quoted, unquoted = match.groups()
+        if key is None:
+            continue
+        if double_quoted is not None:
+            value = double_quoted
+        elif single_quoted is not None:
+            value = single_quoted
+        elif unquoted:
+            # Same inline comment rule as python-dotenv for unquoted values
+            value = (_INLINE_COMMENT_RE.sub(b"", unquoted) if b"#" in unquoted else unquoted).rstrip()
+        else:
+            value = b""
+        variables[key.decode('ascii')] = value.decode('ascii')
+    
+    return variables if position == len(data) else None
+
+def _file_signature(path: Path) -> Optional[Tuple[int, int]]:
+    """(mtime_ns, size) of a file, or None if it cannot be stat'ed"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
 
-@dataclass
+@lru_cache(maxsize=None)
+def _environ_snapshot() -> Mapping[str, str]:
+    """Read-only copy of os.environ, taken once until _invalidate_environ() is called"""
+    return types.MappingProxyType(dict(os.environ))
+
+@lru_cache(maxsize=None)
+def _environ_hash() -> int:
+    """Hash of the environment snapshot, for cache keys"""
+    return hash(frozenset(_environ_snapshot().items()))
+
+def _invalidate_environ():
+    """Take a fresh environment snapshot on next use"""
+    _environ_snapshot.cache_clear()
+    _environ_hash.cache_clear()
+
+# Neither the platform nor the login shell changes while the process runs
+_IS_WINDOWS = platform.system() == "Windows"
+_SHELL = os.environ.get('SHELL', '')
+
+@lru_cache(maxsize=None)
+def _resolve_shell_profile() -> Optional[str]:
+    """Path of the current shell's profile file, looked up once"""
+    if _IS_WINDOWS:
+        # Windows doesn't have traditional shell profiles
+        return None
+    
+    # Unix-like systems
+    home = Path.home()
+    if 'bash' in _SHELL:
+        profiles = ['.bashrc', '.bash_profile', '.profile']
+    elif 'zsh' in _SHELL:
+        profiles = ['.zshrc', '.zprofile']
+    else:
+        return None
+    
+    for profile in profiles:
+        if (home / profile).exists():
+            return str(home / profile)
+    return None
+
+# Slotted, immutable records (no per-instance __dict__) where dataclasses support it
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+@dataclass(frozen=True, **_SLOTS)
 class EnvSource:
     """Represents a source of environment variables"""
     name: str
     type: str  # 'system', 'file', 'shell'
     path: Optional[str]
-    variables: Dict[str, str]
+    variables: Mapping[str, str]
     priority: int  # Higher = more important
     writable: bool
 
-@dataclass
+@dataclass(frozen=True, **_SLOTS)
 class EnvVariable:
     """Complete information about an environment variable"""
     name: str
@@ -79,18 +181,80 @@ class EnvManager:
         'env.example'
     ]
     
+    # Every recognised env file name, for one membership test per directory entry
+    ENV_NAME_SET = frozenset(ENV_FILE_NAMES + ENV_EXAMPLE_NAMES)
+    _EXAMPLE_NAME_SET = frozenset(ENV_EXAMPLE_NAMES)
+    
+    # Name fragments of system variables that are likely relevant to a project,
+    # compiled into one case-insensitive alternation so each name is scanned once
+    _RELEVANT_PATTERNS = (
+        'DATABASE', 'DB_', 'POSTGRES', 'MYSQL', 'MONGO',
+        'REDIS', 'CACHE',
+        'API_', 'SECRET', 'KEY', 'TOKEN',
+        'AWS_', 'AZURE_', 'GCP_',
+        'NODE_', 'PYTHON', 'JAVA_',
+        'PORT', 'HOST', 'URL', 'URI'
+    )
+    _RELEVANT_RE = re.compile('|'.join(map(re.escape, _RELEVANT_PATTERNS)), re.IGNORECASE)
+    
+    # Name fragments that mark a variable as a secret
+    _SECRET_TOKENS = ('key', 'secret', 'password', 'token')
+    _SECRET_RE = re.compile('|'.join(_SECRET_TOKENS), re.IGNORECASE)
+    
     def __init__(self, project_root: str):
         self.project_root = Path(project_root)
-        self.console = Console() if INTERACTIVE_AVAILABLE else None
+        self._console = None
         self.env_sources: List[EnvSource] = []
         self.all_variables: Dict[str, EnvVariable] = {}
+        # Last discover_all_sources result by its cache key, and parsed env files by path
+        self._sources_cache: Dict[tuple, List[EnvSource]] = {}
+        self._file_cache: Dict[str, Tuple[Tuple[int, int], Dict[str, str]]] = {}
+        # Env files found in parent directories, shared by discovery and the setup search
+        self._parent_scan_cache: Optional[List[Tuple[Path, Dict[str, str]]]] = None
+        self._best_example_path: Optional[Path] = None
+        
+    @property
+    def console(self):
+        """Rich console, created on first use (None without the interactive extras)"""
+        if self._console is None and INTERACTIVE_AVAILABLE:
+            from rich.console import Console
+            self._console = Console()
+        return self._console
+    
+    def refresh(self):
+        """Forget cached sources, env files and the environment snapshot, so the next discovery reads everything again"""
+        _invalidate_environ()
+        self._sources_cache = {}
+        self._file_cache = {}
+        self._parent_scan_cache = None
+        self._best_example_path = None
         
     def discover_all_sources(self) -> List[EnvSource]:
         """Discover all environment variable sources"""
+        
+        # One stat per project candidate and one listing per parent level; the results
+        # are both the existence checks below and the cache key
+        project_files = [
+            (env_file, is_example, _file_signature(self.project_root / env_file))
+            for env_names, is_example in ((self.ENV_FILE_NAMES, False), (self.ENV_EXAMPLE_NAMES, True))
+            for env_file in env_names
+        ]
+        parent_files = list(self._iter_env_files_upward())
+        
+        # Reuse the last result while no env file and the environment snapshot are unchanged
+        key = (
+            tuple((env_file, signature) for env_file, _, signature in project_files),
+            tuple((str(env_file), signature) for env_file, _, signature in parent_files),
+            _environ_hash()
+        )
+        if key in self._sources_cache:
+            self.env_sources = self._sources_cache[key]
+            return self.env_sources
+        
         sources = []
         
-        # 1. System environment variables
-        system_vars = dict(os.environ)
+        # 1. System environment variables (the shared read-only snapshot)
+        system_vars = _environ_snapshot()
         sources.append(EnvSource(
             name="System Environment",
             type="system",
@@ -112,12 +276,11 @@ class EnvManager:
                 writable=True
             ))
         
-        # 3. .env files in project
-        for env_file in self.ENV_FILE_NAMES + self.ENV_EXAMPLE_NAMES:
-            env_path = self.project_root / env_file
-            if env_path.exists():
-                env_vars = self._parse_env_file(env_path)
-                is_example = any(example in env_file for example in ['example', 'sample', 'template'])
+        # 3. .env files in project, regular files first and then examples
+        for env_file, is_example, signature in project_files:
+            if signature is not None:
+                env_path = self.project_root / env_file
+                env_vars = self._load_env_file(env_path, signature)
                 
                 sources.append(EnvSource(
                     name=f"File: {env_file}",
@@ -128,7 +291,11 @@ class EnvManager:
                     writable=True
                 ))
         
-        # 4. Look for .env files in parent directories (for monorepos)
+        # 4. Look for .env files in parent directories (for monorepos),
+        # from the listing taken above
+        self._parent_scan_cache = [
+            (env_file, self._load_env_file(env_file, signature)) for env_file, _, signature in parent_files
+        ]
         parent_env_files = self._find_parent_env_files()
         for env_file, env_vars in parent_env_files:
             sources.append(EnvSource(
@@ -141,8 +308,23 @@ class EnvManager:
             ))
         
         self.env_sources = sources
+        self._sources_cache = {key: sources}
         return sources
     
+    def _load_env_file(self, env_file: Path,
+                       signature: Optional[Tuple[int, int]] = None) -> Dict[str, str]:
+        """Parse an env file, reusing the previous result while the file is unchanged"""
+        if signature is None:
+            signature = _file_signature(env_file)
+        cached = self._file_cache.get(str(env_file))
+        if signature is not None and cached is not None and cached[0] == signature:
+            return cached[1]
+        
+        env_vars = self._parse_env_file(env_file, signature[1] if signature is not None else None)
+        if signature is not None:
+            self._file_cache[str(env_file)] = (signature, env_vars)
+        return env_vars
+    
     def smart_env_setup(self) -> bool:
         """
         Smart .env file setup (enhanced version of main.py logic)
@@ -159,6 +341,7 @@ class EnvManager:
             rprint(f"[green]✅ .env file already exists: {env_path}[/green]")
             
             if INTERACTIVE_AVAILABLE:
+                import questionary
                 action = questionary.select(
                     "What would you like to do?",
                     choices=[
@@ -179,41 +362,45 @@ class EnvManager:
             return True
         
         elif env_example_path:
-            rprint(f"[yellow]⚠️ .env not found, but found: {env_example_path.name}[/yellow]")
-            rprint("[cyan]🔧 Creating .env file from example...[/cyan]")
+            rprint(f"[yellow]⚠️ .env not found, but found: {env_example_path.name}[/yellow]\n"
+                   "[cyan]🔧 Creating .env file from example...[/cyan]")
             
             try:
                 # Create .env from example
                 shutil.copy2(env_example_path, env_path)
                 
-                # Load and analyze the new .env file
+                # Load and analyze the new .env file; the environment snapshot is stale now
                 load_dotenv(env_path)
-                rprint(f"[green]✅ Created .env file: {env_path}[/green]")
-                
-                # Show what was created
-                env_vars = self._parse_env_file(env_path)
-                rprint(f"[dim]📝 Created with {len(env_vars)} environment variables[/dim]")
+                _invalidate_environ()
                 
-                # Provide next steps
-                rprint("[yellow]💡 Next steps:[/yellow]")
-                rprint("   1. Review and update values in the new .env file")
-                rprint("   2. Run 'envdoctor --analyze' to check for issues")
-                rprint("   3. Never commit .env files to version control")
+                # Show what was created and provide next steps, in one print
+                env_vars = self._load_env_file(env_path)
+                rprint("\n".join([
+                    f"[green]✅ Created .env file: {env_path}[/green]",
+                    f"[dim]📝 Created with {len(env_vars)} environment variables[/dim]",
+                    "[yellow]💡 Next steps:[/yellow]",
+                    "   1. Review and update values in the new .env file",
+                    "   2. Run 'envdoctor --analyze' to check for issues",
+                    "   3. Never commit .env files to version control"
+                ]))
                 
                 return True
                 
             except Exception as e:
-                rprint(f"[red]❌ Failed to create .env from example: {e}[/red]")
-                rprint("[yellow]⚠️ You may need to create .env file manually[/yellow]")
+                rprint(f"[red]❌ Failed to create .env from example: {e}[/red]\n"
+                       "[yellow]⚠️ You may need to create .env file manually[/yellow]")
                 return False
         
         else:
             # No .env or .env.example found
-            rprint("[red]❌ CRITICAL: Neither .env nor .env.example file found![/red]")
-            rprint(f"[dim]📁 Searched in: {self.project_root}[/dim]")
-            rprint("[yellow]🔧 Recommendations:[/yellow]")
+            rprint("\n".join([
+                "[red]❌ CRITICAL: Neither .env nor .env.example file found![/red]",
+                f"[dim]📁 Searched in: {self.project_root}[/dim]",
+                "[yellow]🔧 Recommendations:[/yellow]"
+            ]))
             
             if INTERACTIVE_AVAILABLE:
+                import questionary
                 action = questionary.select(
                     "What would you like to do?",
                     choices=[
@@ -232,36 +419,45 @@ class EnvManager:
                     return self._show_relevant_system_vars()
             
             else:
-                rprint("   1. Create .env.example file with your project's environment variables")
-                rprint("   2. Copy .env.example to .env and update values")
-                rprint("   3. Run 'envdoctor --setup' again")
+                rprint("\n".join([
+                    "   1. Create .env.example file with your project's environment variables",
+                    "   2. Copy .env.example to .env and update values",
+                    "   3. Run 'envdoctor --setup' again"
+                ]))
                 
             return False
     
     def _find_best_example_file(self) -> Optional[Path]:
         """Find the best .env.example file"""
+        if self._best_example_path is not None and self._best_example_path.exists():
+            return self._best_example_path
+        
+        names = self._project_file_names()
         for example_name in self.ENV_EXAMPLE_NAMES:
-            example_path = self.project_root / example_name
-            if example_path.exists():
-                return example_path
+            if example_name in names:
+                self._best_example_path = self.project_root / example_name
+                return self._best_example_path
         return None
     
     def _analyze_existing_env(self, env_path: Path) -> bool:
         """Analyze existing .env file"""
-        env_vars = self._parse_env_file(env_path)
+        env_vars = self._load_env_file(env_path)
         
         rprint(f"[cyan]📊 .env File Analysis: {env_path.name}[/cyan]")
         
+        from rich.table import Table
         table = Table(title="Environment Variables", show_header=True)
         table.add_column("Variable", style="cyan")
         table.add_column("Value Length", style="green")
         table.add_column("Type", style="yellow")
         
-        for name, value in env_vars.items():
-            value_len = len(value) if value else 0
-            var_type = "Empty" if not value else "Secret" if any(secret in name.lower() for secret in ['key', 'secret', 'password', 'token']) else "Config"
-            
-            table.add_row(name, str(value_len), var_type)
+        secret_search = self._SECRET_RE.search
+        rows = [
+            (name, str(len(value)), "Secret" if secret_search(name) else "Config") if value else (name, "0", "Empty")
+            for name, value in env_vars.items()
+        ]
+        for row in rows:
+            table.add_row(*row)
         
         if self.console:
             self.console.print(table)
@@ -274,27 +470,27 @@ class EnvManager:
             rprint("[yellow]⚠️ No .env.example file found for comparison[/yellow]")
             return False
         
-        env_vars = self._parse_env_file(env_path)
-        example_vars = self._parse_env_file(example_path)
+        env_vars = self._load_env_file(env_path)
+        example_vars = self._load_env_file(example_path)
         
-        # Find differences
-        missing_in_env = set(example_vars.keys()) - set(env_vars.keys())
-        extra_in_env = set(env_vars.keys()) - set(example_vars.keys())
-        common_vars = set(env_vars.keys()) & set(example_vars.keys())
+        # Find differences; key views support set operations without copying the keys first
+        missing_in_env = example_vars.keys() - env_vars.keys()
+        extra_in_env = env_vars.keys() - example_vars.keys()
+        common_vars = env_vars.keys() & example_vars.keys()
         
-        rprint("[cyan]📊 .env vs .env.example Comparison[/cyan]")
+        # The whole comparison is printed at once, however many variables differ
+        lines = ["[cyan]📊 .env vs .env.example Comparison[/cyan]"]
         
         if missing_in_env:
-            rprint(f"[red]❌ Missing in .env ({len(missing_in_env)}):[/red]")
-            for var in sorted(missing_in_env):
-                rprint(f"   - {var}")
+            lines.append(f"[red]❌ Missing in .env ({len(missing_in_env)}):[/red]")
+            lines.extend(f"   - {var}" for var in sorted(missing_in_env))
         
         if extra_in_env:
-            rprint(f"[yellow]⚠️ Extra in .env ({len(extra_in_env)}):[/yellow]")
-            for var in sorted(extra_in_env):
-                rprint(f"   + {var}")
+            lines.append(f"[yellow]⚠️ Extra in .env ({len(extra_in_env)}):[/yellow]")
+            lines.extend(f"   + {var}" for var in sorted(extra_in_env))
         
-        rprint(f"[green]✅ Common variables: {len(common_vars)}[/green]")
+        lines.append(f"[green]✅ Common variables: {len(common_vars)}[/green]")
+        rprint("\n".join(lines))
         
         return True
     
@@ -330,16 +526,18 @@ class EnvManager:
         
         example_path = self.project_root / ".env.example"
         
+        # Build the whole template first and write it in one go
+        parts = [
+            f"# Environment Variables for {project_type} Project\n",
+            "# Copy this file to .env and update the values\n\n"
+        ]
+        for section, vars_dict in template_vars.items():
+            parts.append(f"# {section}\n")
+            parts.extend(f"{var_name}=  # {description}\n" for var_name, description in vars_dict.items())
+            parts.append("\n")
+        
         try:
-            with open(example_path, 'w') as f:
-                f.write(f"# Environment Variables for {project_type} Project\n")
-                f.write("# Copy this file to .env and update the values\n\n")
-                
-                for section, vars_dict in template_vars.items():
-                    f.write(f"# {section}\n")
-                    for var_name, description in vars_dict.items():
-                        f.write(f"{var_name}=  # {description}\n")
-                    f.write("\n")
+            example_path.write_text(''.join(parts), encoding='utf-8')
             
             rprint(f"[green]✅ Created .env.example template: {example_path}[/green]")
             rprint("[yellow]💡 Please review and customize the template, then copy to .env[/yellow]")
@@ -352,20 +550,29 @@ class EnvManager:
     
     def _detect_project_type(self) -> str:
         """Detect what type of project this is"""
+        names = self._project_file_names()
         
-        if (self.project_root / "requirements.txt").exists() or (self.project_root / "pyproject.toml").exists():
-            if any((self.project_root / file).exists() for file in ["app.py", "main.py", "manage.py"]):
+        if "requirements.txt" in names or "pyproject.toml" in names:
+            if not names.isdisjoint(("app.py", "main.py", "manage.py")):
                 return "Python Web Application"
             return "Python Application"
         
-        if (self.project_root / "package.json").exists():
+        if "package.json" in names:
             return "Node.js Application"
         
-        if (self.project_root / "Dockerfile").exists():
+        if "Dockerfile" in names:
             return "Containerized Application"
         
         return "General Application"
     
+    def _project_file_names(self) -> Set[str]:
+        """Names of the files in the project root, from a single directory listing"""
+        try:
+            with os.scandir(self.project_root) as entries:
+                return {entry.name for entry in entries if entry.is_file()}
+        except OSError:
+            return set()
+    
     def _get_template_vars_for_project(self, project_type: str) -> Dict[str, Dict[str, str]]:
         """Get template environment variables based on project type"""
         
@@ -403,29 +610,17 @@ class EnvManager:
     def _search_parent_env_files(self) -> bool:
         """Search for .env files in parent directories"""
         
-        current_path = self.project_root.parent
-        found_files = []
-        
-        # Search up to 3 levels up
-        for _ in range(3):
-            if current_path == current_path.parent:  # Reached root
-                break
-            
-            for env_name in self.ENV_FILE_NAMES + self.ENV_EXAMPLE_NAMES:
-                env_file = current_path / env_name
-                if env_file.exists():
-                    found_files.append(env_file)
-            
-            current_path = current_path.parent
+        found_files = [env_file for env_file, _ in self._find_parent_env_files()]
         
         if found_files:
-            rprint(f"[green]📁 Found {len(found_files)} .env file(s) in parent directories:[/green]")
-            
-            for i, env_file in enumerate(found_files, 1):
-                rel_path = os.path.relpath(env_file, self.project_root)
-                rprint(f"   {i}. {rel_path}")
+            lines = [f"[green]📁 Found {len(found_files)} .env file(s) in parent directories:[/green]"]
+            lines.extend(
+                f"   {i}. {os.path.relpath(env_file, self.project_root)}" for i, env_file in enumerate(found_files, 1)
+            )
+            rprint("\n".join(lines))
             
             if INTERACTIVE_AVAILABLE:
+                import questionary
                 choices = [f"{os.path.relpath(f, self.project_root)} - Copy to current project" for f in found_files]
                 choices.append("None of these")
                 
@@ -453,33 +648,28 @@ class EnvManager:
     def _show_relevant_system_vars(self) -> bool:
         """Show system environment variables that might be relevant"""
         
-        relevant_patterns = [
-            'DATABASE', 'DB_', 'POSTGRES', 'MYSQL', 'MONGO',
-            'REDIS', 'CACHE',
-            'API_', 'SECRET', 'KEY', 'TOKEN',
-            'AWS_', 'AZURE_', 'GCP_',
-            'NODE_', 'PYTHON', 'JAVA_',
-            'PORT', 'HOST', 'URL', 'URI'
-        ]
-        
-        system_vars = dict(os.environ)
+        relevant_search = self._RELEVANT_RE.search
+        critical_vars = self.SYSTEM_CRITICAL_VARS
         relevant_vars = {}
         
-        for var_name, var_value in system_vars.items():
-            if any(pattern in var_name.upper() for pattern in relevant_patterns):
-                if var_name not in self.SYSTEM_CRITICAL_VARS:
-                    relevant_vars[var_name] = var_value
+        for var_name, var_value in _environ_snapshot().items():
+            if var_name not in critical_vars and relevant_search(var_name):
+                relevant_vars[var_name] = var_value
         
         if relevant_vars:
             rprint(f"[cyan]🖥️ Found {len(relevant_vars)} potentially relevant system variables:[/cyan]")
             
+            from rich.table import Table
             table = Table(show_header=True, header_style="bold magenta")
             table.add_column("Variable", style="cyan")
             table.add_column("Value Preview", style="green")
             
-            for var_name, var_value in list(relevant_vars.items())[:20]:  # Show first 20
-                preview = var_value[:50] + "..." if len(var_value) > 50 else var_value
-                table.add_row(var_name, preview)
+            rows = [
+                (var_name, var_value[:50] + "..." if len(var_value) > 50 else var_value)
+                for var_name, var_value in islice(relevant_vars.items(), 20)  # Show first 20
+            ]
+            for row in rows:
+                table.add_row(*row)
             
             if self.console:
                 self.console.print(table)
@@ -499,69 +689,69 @@ class EnvManager:
     
     def _get_shell_profile_path(self) -> Optional[str]:
         """Get path to shell profile file"""
-        home = Path.home()
-        
-        if platform.system() == "Windows":
-            # Windows doesn't have traditional shell profiles
-            return None
-        else:
-            # Unix-like systems
-            shell = os.environ.get('SHELL', '')
-            if 'bash' in shell:
-                for profile in ['.bashrc', '.bash_profile', '.profile']:
-                    if (home / profile).exists():
-                        return str(home / profile)
-            elif 'zsh' in shell:
-                for profile in ['.zshrc', '.zprofile']:
-                    if (home / profile).exists():
-                        return str(home / profile)
-        
-        return None
+        return _resolve_shell_profile()
     
-    def _parse_env_file(self, env_file: Path) -> Dict[str, str]:
+    def _parse_env_file(self, env_file: Path, size: Optional[int] = None) -> Dict[str, str]:
         """Parse environment file and return variables"""
-        variables = {}
         
         try:
-            with open(env_file, 'r', encoding='utf-8') as f:
-                for line_num, line in enumerate(f, 1):
-                    line = line.strip()
-                    
-                    # Skip empty lines and comments
-                    if not line or line.startswith('#'):
-                        continue
-                    
-                    # Parse KEY=VALUE
-                    if '=' in line:
-                        key, value = line.split('=', 1)
-                        key = key.strip()
-                        value = value.strip().strip('"').strip("'")
-                        variables[key] = value
-                        
-        except Exception as e:
+            # Plain files are parsed with one regex scan, larger ones from an mmap
+            if size is None:
+                size = os.path.getsize(env_file)
+            if size >= _MMAP_MIN_SIZE:
+                with open(env_file, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                    variables = _parse_plain_env(data)
+            else:
+                with open(env_file, 'rb') as f:
+                    variables = _parse_plain_env(f.read())
+            if variables is not None:
+                return variables
+            
+            # python-dotenv parses the whole file in one pass and handles export
+            # prefixes, quoting, escapes and inline comments; values are kept raw
+            parsed = DotEnv(dotenv_path=env_file, verbose=False, encoding='utf-8', interpolate=False).dict()
+        except (OSError, UnicodeDecodeError) as e:
             print(f"Warning: Error parsing {env_file}: {e}")
+            return {}
         
-        return variables
+        # Bare names without a value are not definitions
+        return {key: value for key, value in parsed.items() if value is not None}
     
-    def _find_parent_env_files(self) -> List[Tuple[Path, Dict[str, str]]]:
-        """Find .env files in parent directories"""
-        parent_files = []
+    def _iter_env_files_upward(self, levels: int = 3) -> Iterator[Tuple[Path, bool, Tuple[int, int]]]:
+        """Yield (path, is_example, (mtime_ns, size)) for non-empty env files in parent directories"""
+        env_names = self.ENV_FILE_NAMES + self.ENV_EXAMPLE_NAMES
         current_path = self.project_root.parent
         
-        # Search up to 3 levels
-        for _ in range(3):
-            if current_path == current_path.parent:
+        for _ in range(levels):
+            if current_path == current_path.parent:  # Reached root
                 break
             
-            for env_name in self.ENV_FILE_NAMES + self.ENV_EXAMPLE_NAMES:
-                env_file = current_path / env_name
-                if env_file.exists():
-                    env_vars = self._parse_env_file(env_file)
-                    parent_files.append((env_file, env_vars))
+            # One directory listing per level instead of a stat per candidate name
+            found = {}
+            try:
+                with os.scandir(current_path) as entries:
+                    for entry in entries:
+                        if entry.name in self.ENV_NAME_SET and entry.is_file(follow_symlinks=False):
+                            stat = entry.stat(follow_symlinks=False)
+                            if stat.st_size > 0:
+                                found[entry.name] = (stat.st_mtime_ns, stat.st_size)
+            except OSError:
+                pass
+            
+            # Keep the order of preference of the name lists
+            for env_name in sorted(found, key=env_names.index):
+                yield current_path / env_name, env_name in self._EXAMPLE_NAME_SET, found[env_name]
             
             current_path = current_path.parent
-        
-        return parent_files
+    
+    def _find_parent_env_files(self) -> List[Tuple[Path, Dict[str, str]]]:
+        """Find .env files in parent directories"""
+        if self._parent_scan_cache is None:
+            self._parent_scan_cache = [
+                (env_file, self._load_env_file(env_file, signature))
+                for env_file, _, signature in self._iter_env_files_upward()
+            ]
+        return self._parent_scan_cache
     
     def show_complete_environment_view(self):
         """Show complete view of all environment sources"""
@@ -571,7 +761,12 @@ class EnvManager:
         
         rprint("[bold blue]🌍 Complete Environment Overview[/bold blue]")
         
+        # Without a console the table would never be shown, so don't build it
+        if self.console is None:
+            return self.env_sources
+        
         # Show sources
+        from rich.table import Table
         sources_table = Table(title="Environment Sources", show_header=True)
         sources_table.add_column("Source", style="cyan")
         sources_table.add_column("Type", style="yellow")
@@ -579,17 +774,16 @@ class EnvManager:
         sources_table.add_column("Priority", style="magenta")
         sources_table.add_column("Writable", style="red")
         
-        for source in sorted(self.env_sources, key=lambda x: x.priority, reverse=True):
-            sources_table.add_row(
-                source.name,
-                source.type,
-                str(len(source.variables)),
-                str(source.priority),
-                "Yes" if source.writable else "No"
-            )
+        # Columns are read once per source; the sort leaves env_sources in discovery order
+        rows = [
+            (source.name, source.type, str(len(source.variables)), str(source.priority),
+             "Yes" if source.writable else "No")
+            for source in sorted(self.env_sources, key=attrgetter('priority'), reverse=True)
+        ]
+        for row in rows:
+            sources_table.add_row(*row)
         
-        if self.console:
-            self.console.print(sources_table)
+        self.console.print(sources_table)
         
         return self.env_sources
 
@@ -5,20 +5,107 @@ and compares against system and file-based environment sources
 """
 
 import ast
+import importlib.util
+import logging
+import mmap
 import re
 import os
+import string
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
-from typing import Dict, List, Set, Tuple, Optional, Any
+from typing import Dict, List, Set, Tuple, Optional, Any, Callable, Iterator
 from dataclasses import dataclass
 import fnmatch
+from bisect import bisect_left
 
-@dataclass
+_log = logging.getLogger(__name__)
+
+YAML_AVAILABLE = importlib.util.find_spec('yaml') is not None
+
+_NEWLINE_RE = re.compile('\n')
+_NEWLINE_BYTES_RE = re.compile(b'\n')
+
+# Non-Python files at least this large are memory-mapped and scanned as bytes
+_MMAP_MIN_SIZE = 64 * 1024
+
+def _newline_offsets(content) -> List[int]:
+    """Offsets of every newline in content (str or bytes), for bisecting match positions to lines"""
+    regex = _NEWLINE_RE if isinstance(content, str) else _NEWLINE_BYTES_RE
+    return [match.start() for match in regex.finditer(content)]
+
+def _yaml_child(node: Any, key: str) -> Any:
+    """Value node stored under a plain key of a YAML mapping node, or None"""
+    import yaml
+    if isinstance(node, yaml.MappingNode):
+        for key_node, value_node in node.value:
+            if isinstance(key_node, yaml.ScalarNode) and key_node.value == key:
+                return value_node
+    return None
+
+def _line_at(content, newlines: List[int], line_num: int):
+    """Text of a 1-based line, sliced out of content between its newline offsets"""
+    if line_num > len(newlines) + 1:
+        return ""
+    start = newlines[line_num - 2] + 1 if line_num > 1 else 0
+    end = newlines[line_num - 1] if line_num <= len(newlines) else len(content)
+    return content[start:end]
+
+def _compile_env_patterns(patterns: List[str], prefiltered: Dict[str, str]) -> Tuple[Tuple[Any, bool], ...]:
+    """Compile the patterns that capture a name, each paired with whether its hits still need checking"""
+    compiled = []
+    for pattern in patterns:
+        regex = re.compile(prefiltered.get(pattern, pattern), re.MULTILINE)
+        if regex.groups:
+            compiled.append((regex, pattern not in prefiltered))
+    return tuple(compiled)
+
+def _compile_glob(pattern: str) -> Tuple[Callable, ...]:
+    """Compile a relative glob into one matcher per path component, last component first"""
+    return tuple(re.compile(fnmatch.translate(os.path.normcase(part))).match
+                 for part in reversed(pattern.split('/')))
+
+def _glob_matches(matchers: Tuple[Callable, ...], parts: Tuple[str, ...]) -> bool:
+    """Check reversed path components against a compiled glob, like rglob does"""
+    return len(parts) >= len(matchers) and all(match(part) for match, part in zip(matchers, parts))
+
+# Dotted call targets and subscripted names that read the environment, mapped to the access method
+_ENV_CALLS = {
+    'os.getenv': 'os.getenv',
+    'os.environ.get': 'os.environ.get',
+    'environ.get': 'environ.get',  # if imported directly
+    'getenv': 'getenv', 'get_env': 'get_env', 'env_var': 'env_var',
+    'get_setting': 'get_setting', 'get_config': 'get_config',
+}
+_ENV_SUBSCRIPTS = {'os.environ': 'os.environ[]', 'environ': 'environ[]'}
+# Every call or subscript above contains one of these, so a source without them can skip ast.parse
+_ENV_HOT_TOKENS = ('environ', 'getenv', 'get_env', 'env_var', 'get_setting', 'get_config')
+_ENV_NAME_MAX_PARTS = 3
+
+def _dotted_name(node: ast.AST) -> Optional[str]:
+    """Dotted name of a short Name/Attribute chain such as os.environ.get, else None"""
+    parts = []
+    while isinstance(node, ast.Attribute):
+        if len(parts) == _ENV_NAME_MAX_PARTS:
+            return None
+        parts.append(node.attr)
+        node = node.value
+    if not isinstance(node, ast.Name):
+        return None
+    parts.append(node.id)
+    return '.'.join(reversed(parts))
+
+# Slotted records (no per-instance __dict__) where dataclasses support it
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+@dataclass(**_SLOTS)
 class EnvUsage:
     """Represents a usage of an environment variable in code"""
     file_path: str
     line_number: int
     column: int
-    variable_name: str
+    variable_name: str  # interned, since the same names recur across files
     access_method: str  # 'os.getenv', 'os.environ', 'dotenv', etc.
     has_default: bool
     default_value: Optional[str]
@@ -26,7 +113,7 @@ class EnvUsage:
     function_name: Optional[str] = None  # Function/method where it's used
     class_name: Optional[str] = None     # Class where it's used
 
-@dataclass
+@dataclass(**_SLOTS)
 class EnvDefinition:
     """Represents a definition of an environment variable"""
     file_path: str
@@ -37,7 +124,7 @@ class EnvDefinition:
     is_example: bool = False
     is_sensitive: bool = False  # Contains secrets/passwords
 
-@dataclass
+@dataclass(**_SLOTS)
 class ScanResult:
     """Complete scan results"""
     usages: List[EnvUsage]
@@ -96,6 +183,27 @@ class EnhancedEnvScanner:
         r'[\'"]([A-Z][A-Z_0-9]{2,})[\'"]',
     ]
     
+    # Name checks for _looks_like_env_var, which runs on every regex hit
+    _ENV_NAME_DELETE = str.maketrans('', '', string.ascii_uppercase + string.digits + '_')
+    _NON_ENV_PREFIXES = (
+        'HTTP_', 'HTTPS_', 'GET', 'POST', 'PUT', 'DELETE',  # HTTP methods
+        'SQL', 'SELECT', 'INSERT', 'UPDATE',                # SQL keywords
+        'TRUE', 'FALSE', 'NULL', 'NONE',                    # Constants
+    )
+    
+    # The quoted-uppercase pattern hits most string constants. Its group already has the shape of
+    # an env var name, so the excluded prefixes are rejected in the regex and its hits skip the check.
+    _PREFILTERED_PATTERNS = {
+        r'[\'"]([A-Z][A-Z_0-9]{2,})[\'"]':
+            r'[\'"](?!' + '|'.join(_NON_ENV_PREFIXES) + r')([A-Z][A-Z_0-9]{2,})[\'"]',
+    }
+    # Patterns without a capture group never yield a variable name, so they are not scanned
+    _ENV_REGEXES = _compile_env_patterns(ENV_PATTERNS, _PREFILTERED_PATTERNS)
+    _ENV_BYTES_REGEXES = tuple((re.compile(regex.pattern.encode('ascii'), re.MULTILINE), check_name)
+                               for regex, check_name in _ENV_REGEXES)
+    # Bytes that make a bytes scan differ from the decoded one (\r, \x1c-\x1f, non-ASCII)
+    _NOT_PLAIN_TEXT_RE = re.compile(rb'[^\t\n\x0b\x0c\x20-\x7e]')
+    
     # File patterns to include/exclude
     INCLUDE_PATTERNS = [
         '*.py', '*.pyx', '*.pyi',
@@ -104,6 +212,7 @@ class EnhancedEnvScanner:
         '*.sh', '*.bash', '*.zsh',  # Shell scripts
         '*.json',  # Config files
     ]
+    _INCLUDE_GLOBS = tuple(map(_compile_glob, INCLUDE_PATTERNS))
     
     EXCLUDE_PATTERNS = [
         '__pycache__/*', '.git/*', '.svn/*', '*.pyc', '*.pyo',
@@ -111,6 +220,12 @@ class EnhancedEnvScanner:
         'node_modules/*', '.env', '.env.*', 'venv/*', 'env/*', '.venv/*',
         '*.min.js', '*.bundle.js',  # Minified files
     ]
+    # One alternation of the translated globs, equivalent to fnmatch against each pattern
+    _EXCLUDE_RE = re.compile('|'.join(fnmatch.translate(os.path.normcase(pattern))
+                                      for pattern in EXCLUDE_PATTERNS))
+    # Top-level directories excluded wholesale ('node_modules/*'); the walk never enters them
+    _EXCLUDE_DIRS = frozenset(os.path.normcase(pattern[:-2]) for pattern in EXCLUDE_PATTERNS
+                              if pattern.endswith('/*'))
     
     ENV_FILE_PATTERNS = [
         '.env*', 'env.*', '*.env',
@@ -120,22 +235,41 @@ class EnhancedEnvScanner:
         '.gitlab-ci.yml', 'azure-pipelines.yml',
         'Dockerfile*', '*.Dockerfile',
     ]
+    _ENV_FILE_GLOBS = tuple(map(_compile_glob, ENV_FILE_PATTERNS))
     
     # Sensitive variable patterns
     SENSITIVE_PATTERNS = [
         'password', 'passwd', 'pwd', 'secret', 'key', 'token', 'auth',
         'credential', 'private', 'cert', 'ssl', 'api_key', 'access_key'
     ]
+    # Searched in lowercased names, so it matches exactly when one of the patterns is a substring
+    _SENSITIVE_RE = re.compile('|'.join(map(re.escape, SENSITIVE_PATTERNS)))
+    
+    # Compiled once; these run for every scanned file
+    # KEY=value lines, skipping comments; keys and values are stripped afterwards
+    _ENV_ASSIGNMENT_RE = re.compile(r'^(?![^\S\n]*#)[^\S\n]*([^=\n]*)=(.*)$', re.MULTILINE)
+    _DOCKER_ENV_RE = re.compile(r'^[^\S\n]*ENV (.*)$', re.MULTILINE)
+    # The alternatives can never match overlapping text, so one pass finds what three separate scans did
+    _YAML_ENV_RE = re.compile(
+        r'\$\{([A-Z_][A-Z0-9_]*)\}'   # ${VAR_NAME}
+        r'|\$([A-Z_][A-Z0-9_]*)'       # $VAR_NAME
+        r'|env:\s*([A-Z_][A-Z0-9_]*)'  # env: VAR_NAME
+    )
+    
+    # Below this many code files, starting worker processes costs more than it saves
+    PARALLEL_MIN_FILES = 256
     
     def __init__(self, project_root: str):
         self.project_root = Path(project_root)
         self.usages: List[EnvUsage] = []
         self.definitions: List[EnvDefinition] = []
         self.system_vars = dict(os.environ)
+        self._files: Optional[List[Tuple[Path, str, Tuple[str, ...], bool]]] = None
         
     def scan_everything(self) -> ScanResult:
         """Scan everything: code, files, and system environment"""
-        print(f"🔍 Enhanced scanning of project: {self.project_root}")
+        _log.info("🔍 Enhanced scanning of project: %s", self.project_root)
+        self._files = None
         
         # 1. Scan Python files for usage
         code_usages = self._scan_code_files()
@@ -146,14 +280,15 @@ class EnhancedEnvScanner:
         # 3. Get system environment variables
         system_definitions = self._get_system_definitions()
         
-        # 4. Combine all definitions
-        all_definitions = file_definitions + system_definitions
+        # 4. Combine all definitions, extending in place rather than copying both lists
+        all_definitions = file_definitions
+        all_definitions.extend(system_definitions)
         
         # 5. Calculate usage statistics
         stats = self._calculate_usage_stats(code_usages, all_definitions)
         
         # 6. Build file variables mapping
-        file_vars = self._build_file_variables_mapping(file_definitions)
+        file_vars = self._build_file_variables_mapping(all_definitions)
         
         self.usages = code_usages
         self.definitions = all_definitions
@@ -168,102 +303,191 @@ class EnhancedEnvScanner:
     
     def _scan_code_files(self) -> List[EnvUsage]:
         """Scan all code files for environment variable usage"""
-        usages = []
-        
         # Find all code files
-        code_files = []
-        for pattern in self.INCLUDE_PATTERNS:
-            if pattern.startswith('*'):
-                code_files.extend(self.project_root.rglob(pattern))
-            else:
-                code_files.extend(self.project_root.glob(f"**/{pattern}"))
+        code_files = self._find_files(self._INCLUDE_GLOBS)
         
         # Filter files
         filtered_files = []
-        for file_path in code_files:
-            if file_path.is_file() and self._should_scan_file(file_path):
+        for file_path, rel_path, is_file in code_files:
+            if is_file and self._should_scan_file(rel_path):
                 filtered_files.append(file_path)
         
-        print(f"📁 Found {len(filtered_files)} code files to scan")
+        _log.info("📁 Found %d code files to scan", len(filtered_files))
         
-        # Scan each file
-        for file_path in filtered_files:
-            try:
-                file_usages = self._scan_single_file(file_path)
-                usages.extend(file_usages)
-            except Exception as e:
-                print(f"⚠️ Error scanning {file_path}: {e}")
+        usages = list(self._iter_code_usages(filtered_files))
         
-        print(f"🔍 Found {len(usages)} environment variable usages")
+        _log.info("🔍 Found %d environment variable usages", len(usages))
         return usages
     
-    def _should_scan_file(self, file_path: Path) -> bool:
-        """Check if file should be scanned"""
-        rel_path = str(file_path.relative_to(self.project_root))
-        
-        # Check exclude patterns
-        for pattern in self.EXCLUDE_PATTERNS:
-            if fnmatch.fnmatch(rel_path, pattern):
-                return False
+    def _iter_code_usages(self, files: List[Path]) -> Iterator[EnvUsage]:
+        """Yield the usages of each file in order, scanning files only as results are consumed"""
+        done = 0
+        # Parsing is CPU-bound, so large projects use a process pool
+        if len(files) >= self.PARALLEL_MIN_FILES and (os.cpu_count() or 1) > 1:
+            try:
+                with ProcessPoolExecutor(initializer=_init_scan_worker,
+                                         initargs=(type(self), str(self.project_root))) as executor:
+                    for file_usages, records, error in executor.map(_scan_file_in_worker, files, chunksize=32):
+                        file_path = files[done]
+                        done += 1
+                        for record in records:
+                            if _log.isEnabledFor(record.levelno):
+                                _log.handle(record)
+                        if error is None:
+                            for usage in file_usages:
+                                # Names arrive as fresh copies from the worker's pickle
+                                usage.variable_name = sys.intern(usage.variable_name)
+                            yield from file_usages
+                        else:
+                            _log.warning("⚠️ Error scanning %s: %s", file_path, error)
+            except (OSError, BrokenProcessPool):
+                pass  # scan whatever the pool did not finish in this process
         
-        return True
+        for file_path in files[done:]:
+            try:
+                file_usages = self._scan_single_file(file_path)
+            except Exception as e:
+                _log.warning("⚠️ Error scanning %s: %s", file_path, e)
+                continue
+            yield from file_usages
+    
+    def _project_files(self) -> List[Tuple[Path, str, Tuple[str, ...], bool]]:
+        """
+        Walk the project once, in os.walk order, listing each file with its relative path,
+        reversed case-normalized parts and whether it is a regular file
+        """
+        if self._files is None:
+            files = []
+            # Directories still to list as (path, relative prefix, reversed parts), popped depth first;
+            # scandir entries answer is_dir/is_file from the listing, saving a stat per file
+            pending = [(str(self.project_root), '', ())]
+            while pending:
+                dirpath, rel_prefix, dir_parts = pending.pop()
+                try:
+                    with os.scandir(dirpath) as it:
+                        entries = list(it)
+                except OSError:
+                    continue
+                
+                subdirs = []
+                for entry in entries:
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        is_dir = False
+                    if is_dir:
+                        name = os.path.normcase(entry.name)
+                        # Like os.walk, list but do not follow symlinked directories
+                        if not entry.is_symlink() and (dir_parts or name not in self._EXCLUDE_DIRS):
+                            subdirs.append((entry.path, rel_prefix + entry.name + os.sep, (name,) + dir_parts))
+                        continue
+                    try:
+                        is_file = entry.is_file()
+                    except OSError:
+                        is_file = False
+                    files.append((Path(entry.path), rel_prefix + entry.name,
+                                  (os.path.normcase(entry.name),) + dir_parts, is_file))
+                pending.extend(reversed(subdirs))
+            self._files = files
+        return self._files
+    
+    def _find_files(self, globs: Tuple[Tuple[Callable, ...], ...]) -> List[Tuple[Path, str, bool]]:
+        """(path, relative path, is regular file) of files matching each glob in turn, in the order successive rglob calls returned them"""
+        matches: List[List[Tuple[Path, str, bool]]] = [[] for _ in globs]
+        for file_path, rel_path, parts, is_file in self._project_files():
+            for found, matchers in zip(matches, globs):
+                if _glob_matches(matchers, parts):
+                    found.append((file_path, rel_path, is_file))
+        return [entry for found in matches for entry in found]
+    
+    def _should_scan_file(self, rel_path: str) -> bool:
+        """Check if a file, given by its path relative to the project root, should be scanned"""
+        return self._EXCLUDE_RE.match(os.path.normcase(rel_path)) is None
     
     def _scan_single_file(self, file_path: Path) -> List[EnvUsage]:
         """Scan a single file for environment variable usage"""
+        if file_path.suffix != '.py':
+            mapped_usages = self._scan_mapped_file(file_path)
+            if mapped_usages is not None:
+                return mapped_usages
+        
         usages = []
         
         try:
             with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
                 content = f.read()
-                lines = content.splitlines()
         except Exception as e:
-            print(f"⚠️ Cannot read {file_path}: {e}")
+            _log.warning("⚠️ Cannot read %s: %s", file_path, e)
             return usages
         
         # Try AST parsing for Python files
         if file_path.suffix == '.py':
+            if not any(token in content for token in _ENV_HOT_TOKENS):
+                return usages
             try:
                 tree = ast.parse(content)
-                visitor = EnhancedEnvVariableVisitor(str(file_path), lines)
+                visitor = EnhancedEnvVariableVisitor(str(file_path), content)
                 visitor.visit(tree)
                 usages.extend(visitor.usages)
             except SyntaxError:
                 # Fallback to regex for invalid Python syntax
-                usages.extend(self._scan_with_regex(file_path, content, lines))
+                usages.extend(self._scan_with_regex(file_path, content))
         else:
             # Use regex for non-Python files
-            usages.extend(self._scan_with_regex(file_path, content, lines))
+            usages.extend(self._scan_with_regex(file_path, content))
         
         return usages
     
-    def _scan_with_regex(self, file_path: Path, content: str, lines: List[str]) -> List[EnvUsage]:
-        """Scan using regex patterns"""
+    def _scan_mapped_file(self, file_path: Path) -> Optional[List[EnvUsage]]:
+        """Regex-scan a large plain-ASCII file through mmap, without decoding it; None to read it normally"""
+        try:
+            with open(file_path, 'rb') as f:
+                if os.fstat(f.fileno()).st_size < _MMAP_MIN_SIZE:
+                    return None
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                    if self._NOT_PLAIN_TEXT_RE.search(data):
+                        return None
+                    return self._scan_with_regex(file_path, data)
+        except (OSError, ValueError):
+            return None
+    
+    def _scan_with_regex(self, file_path: Path, content) -> List[EnvUsage]:
+        """Scan using regex patterns; content is str, or bytes-like plain ASCII"""
         usages = []
-        
-        for pattern in self.ENV_PATTERNS:
-            for match in re.finditer(pattern, content, re.MULTILINE):
-                groups = match.groups()
-                if groups:
-                    var_name = groups[0]
-                    
-                    # Skip if it's obviously not an environment variable
-                    if not self._looks_like_env_var(var_name):
-                        continue
-                    
-                    line_num = content[:match.start()].count('\n') + 1
-                    col_offset = match.start() - content.rfind('\n', 0, match.start()) - 1
-                    
-                    usage = EnvUsage(
-                        file_path=str(file_path),
-                        line_number=line_num,
-                        column=col_offset,
-                        variable_name=var_name,
-                        access_method='regex_detected',
-                        has_default=False,
-                        default_value=None,
-                        context_line=lines[line_num - 1] if line_num <= len(lines) else ""
-                    )
-                    usages.append(usage)
+        newlines = None  # built on the first accepted match
+        binary = not isinstance(content, str)
+        
+        for regex, check_name in self._ENV_BYTES_REGEXES if binary else self._ENV_REGEXES:
+            for match in regex.finditer(content):
+                var_name = match.group(1)
+                if binary:
+                    var_name = var_name.decode('ascii')
+                
+                # Skip if it's obviously not an environment variable
+                if check_name and not self._looks_like_env_var(var_name):
+                    continue
+                
+                if newlines is None:
+                    newlines = _newline_offsets(content)
+                start = match.start()
+                index = bisect_left(newlines, start)
+                line_num = index + 1
+                col_offset = start - (newlines[index - 1] if index else -1) - 1
+                context_line = _line_at(content, newlines, line_num)
+                if binary:
+                    context_line = context_line.decode('ascii')
+                
+                usage = EnvUsage(
+                    file_path=str(file_path),
+                    line_number=line_num,
+                    column=col_offset,
+                    variable_name=sys.intern(var_name),
+                    access_method='regex_detected',
+                    has_default=False,
+                    default_value=None,
+                    context_line=context_line
+                )
+                usages.append(usage)
         
         return usages
     
@@ -273,41 +497,31 @@ class EnhancedEnvScanner:
         if len(var_name) < 2:
             return False
         
-        if not re.match(r'^[A-Z][A-Z0-9_]*$', var_name):
+        # Uppercase ASCII letter first, then only uppercase letters, digits and underscores
+        if not 'A' <= var_name[0] <= 'Z' or var_name.translate(self._ENV_NAME_DELETE):
             return False
         
         # Skip common non-env patterns
-        exclude_patterns = [
-            'HTTP_', 'HTTPS_', 'GET', 'POST', 'PUT', 'DELETE',  # HTTP methods
-            'SQL', 'SELECT', 'INSERT', 'UPDATE', 'DELETE',      # SQL keywords
-            'TRUE', 'FALSE', 'NULL', 'NONE',                    # Constants
-        ]
-        
-        if any(var_name.startswith(pattern) for pattern in exclude_patterns):
-            return False
-        
-        return True
+        return not var_name.startswith(self._NON_ENV_PREFIXES)
     
     def _scan_config_files(self) -> List[EnvDefinition]:
         """Scan configuration files for environment variable definitions"""
         definitions = []
         
         # Find config files
-        config_files = []
-        for pattern in self.ENV_FILE_PATTERNS:
-            config_files.extend(self.project_root.rglob(pattern))
+        config_files = self._find_files(self._ENV_FILE_GLOBS)
         
-        print(f"📄 Found {len(config_files)} configuration files")
+        _log.info("📄 Found %d configuration files", len(config_files))
         
-        for file_path in config_files:
-            if file_path.is_file():
+        for file_path, _, is_file in config_files:
+            if is_file:
                 try:
                     file_definitions = self._parse_config_file(file_path)
                     definitions.extend(file_definitions)
                 except Exception as e:
-                    print(f"⚠️ Error parsing {file_path}: {e}")
+                    _log.warning("⚠️ Error parsing %s: %s", file_path, e)
         
-        print(f"📄 Found {len(definitions)} file-based variable definitions")
+        _log.info("📄 Found %d file-based variable definitions", len(definitions))
         return definitions
     
     def _parse_config_file(self, file_path: Path) -> List[EnvDefinition]:
@@ -329,6 +543,14 @@ class EnhancedEnvScanner:
         
         return definitions
     
+    @staticmethod
+    def _unquote(value: str) -> str:
+        """Strip whitespace and one pair of matching quotes from a value"""
+        value = value.strip()
+        if value[:1] in ('"', "'") and value[-1:] == value[:1]:
+            return value[1:-1]
+        return value
+    
     def _parse_env_file(self, file_path: Path) -> List[EnvDefinition]:
         """Parse .env file format"""
         definitions = []
@@ -336,34 +558,28 @@ class EnhancedEnvScanner:
         
         try:
             with open(file_path, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
+                content = f.read()
             
-            for line_num, line in enumerate(lines, 1):
-                line = line.strip()
+            newlines = _newline_offsets(content)
+            for match in self._ENV_ASSIGNMENT_RE.finditer(content):
+                key = match.group(1).strip()
+                value = self._unquote(match.group(2))
                 
-                if not line or line.startswith('#'):
-                    continue
+                is_sensitive = self._SENSITIVE_RE.search(key.lower()) is not None
                 
-                if '=' in line:
-                    key, value = line.split('=', 1)
-                    key = key.strip()
-                    value = value.strip().strip('"').strip("'")
-                    
-                    is_sensitive = any(pattern in key.lower() for pattern in self.SENSITIVE_PATTERNS)
-                    
-                    definition = EnvDefinition(
-                        file_path=str(file_path),
-                        line_number=line_num,
-                        variable_name=key,
-                        value=value,
-                        source_type='file',
-                        is_example=is_example,
-                        is_sensitive=is_sensitive
-                    )
-                    definitions.append(definition)
+                definition = EnvDefinition(
+                    file_path=str(file_path),
+                    line_number=bisect_left(newlines, match.start()) + 1,
+                    variable_name=key,
+                    value=value,
+                    source_type='file',
+                    is_example=is_example,
+                    is_sensitive=is_sensitive
+                )
+                definitions.append(definition)
         
         except Exception as e:
-            print(f"⚠️ Error parsing env file {file_path}: {e}")
+            _log.warning("⚠️ Error parsing env file %s: %s", file_path, e)
         
         return definitions
     
@@ -371,25 +587,46 @@ class EnhancedEnvScanner:
         """Parse Docker Compose file for environment variables"""
         definitions = []
         
+        if not YAML_AVAILABLE:
+            return definitions
+        
         try:
+            import yaml
+            # libyaml's C loader when PyYAML was built with it
+            loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
             with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+                root = yaml.compose(f, Loader=loader)
             
-            # Simple regex to find environment variables
-            # This is a basic implementation - would need yaml parsing for full accuracy
-            env_patterns = [
-                r'environment:\s*\n((?:\s+-\s+[A-Z_][A-Z0-9_]*=.*\n)*)',
-                r'-\s+([A-Z_][A-Z0-9_]*=[^\n]*)',
-            ]
+            # services.<name>.environment, as a KEY: value mapping or a list of KEY=value
+            services = _yaml_child(root, 'services')
+            entries = []
+            if isinstance(services, yaml.MappingNode):
+                for _, service in services.value:
+                    environment = _yaml_child(service, 'environment')
+                    if isinstance(environment, yaml.MappingNode):
+                        for key_node, value_node in environment.value:
+                            if isinstance(key_node, yaml.ScalarNode) and isinstance(value_node, yaml.ScalarNode):
+                                entries.append((key_node, key_node.value, value_node.value))
+                    elif isinstance(environment, yaml.SequenceNode):
+                        for item in environment.value:
+                            if isinstance(item, yaml.ScalarNode):
+                                key, _, value = item.value.partition('=')
+                                entries.append((item, key, value))
             
-            for pattern in env_patterns:
-                for match in re.finditer(pattern, content, re.MULTILINE):
-                    # Extract environment variables from match
-                    # This is simplified - real implementation would be more robust
-                    pass
+            for node, key, value in entries:
+                definition = EnvDefinition(
+                    file_path=str(file_path),
+                    line_number=node.start_mark.line + 1,
+                    variable_name=key,
+                    value=value,
+                    source_type='file',
+                    is_example=False,
+                    is_sensitive=self._SENSITIVE_RE.search(key.lower()) is not None
+                )
+                definitions.append(definition)
         
         except Exception as e:
-            print(f"⚠️ Error parsing docker-compose {file_path}: {e}")
+            _log.warning("⚠️ Error parsing docker-compose %s: %s", file_path, e)
         
         return definitions
     
@@ -399,42 +636,40 @@ class EnhancedEnvScanner:
         
         try:
             with open(file_path, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
+                content = f.read()
             
-            for line_num, line in enumerate(lines, 1):
-                line = line.strip()
+            newlines = _newline_offsets(content)
+            for match in self._DOCKER_ENV_RE.finditer(content):
+                # Parse ENV KEY=value or ENV KEY value
+                env_part = match.group(1).strip()
                 
-                if line.startswith('ENV '):
-                    # Parse ENV KEY=value or ENV KEY value
-                    env_part = line[4:].strip()
-                    
-                    if '=' in env_part:
-                        key, value = env_part.split('=', 1)
+                if '=' in env_part:
+                    key, value = env_part.split('=', 1)
+                else:
+                    parts = env_part.split(None, 1)
+                    if len(parts) == 2:
+                        key, value = parts
                     else:
-                        parts = env_part.split(None, 1)
-                        if len(parts) == 2:
-                            key, value = parts
-                        else:
-                            continue
-                    
-                    key = key.strip()
-                    value = value.strip().strip('"').strip("'")
-                    
-                    is_sensitive = any(pattern in key.lower() for pattern in self.SENSITIVE_PATTERNS)
-                    
-                    definition = EnvDefinition(
-                        file_path=str(file_path),
-                        line_number=line_num,
-                        variable_name=key,
-                        value=value,
-                        source_type='file',
-                        is_example=False,
-                        is_sensitive=is_sensitive
-                    )
-                    definitions.append(definition)
+                        continue
+                
+                key = key.strip()
+                value = self._unquote(value)
+                
+                is_sensitive = self._SENSITIVE_RE.search(key.lower()) is not None
+                
+                definition = EnvDefinition(
+                    file_path=str(file_path),
+                    line_number=bisect_left(newlines, match.start()) + 1,
+                    variable_name=key,
+                    value=value,
+                    source_type='file',
+                    is_example=False,
+                    is_sensitive=is_sensitive
+                )
+                definitions.append(definition)
         
         except Exception as e:
-            print(f"⚠️ Error parsing Dockerfile {file_path}: {e}")
+            _log.warning("⚠️ Error parsing Dockerfile %s: %s", file_path, e)
         
         return definitions
     
@@ -446,62 +681,73 @@ class EnhancedEnvScanner:
             with open(file_path, 'r', encoding='utf-8') as f:
                 content = f.read()
             
-            # Look for environment variable patterns in YAML
-            env_patterns = [
-                r'\$\{([A-Z_][A-Z0-9_]*)\}',  # ${VAR_NAME}
-                r'\$([A-Z_][A-Z0-9_]*)',       # $VAR_NAME
-                r'env:\s*([A-Z_][A-Z0-9_]*)', # env: VAR_NAME
-            ]
+            newlines = _newline_offsets(content)
             
-            for pattern in env_patterns:
-                for match in re.finditer(pattern, content):
-                    var_name = match.group(1)
-                    line_num = content[:match.start()].count('\n') + 1
-                    
-                    # This creates a "reference" definition, not a value definition
-                    definition = EnvDefinition(
-                        file_path=str(file_path),
-                        line_number=line_num,
-                        variable_name=var_name,
-                        value="",  # No value in reference
-                        source_type='file',
-                        is_example=False,
-                        is_sensitive=False
-                    )
-                    definitions.append(definition)
+            # Look for environment variable patterns in YAML, grouped by pattern as before
+            found: Tuple[List[EnvDefinition], ...] = ([], [], [])
+            for match in self._YAML_ENV_RE.finditer(content):
+                index = match.lastindex
+                line_num = bisect_left(newlines, match.start()) + 1
+                
+                # This creates a "reference" definition, not a value definition
+                definition = EnvDefinition(
+                    file_path=str(file_path),
+                    line_number=line_num,
+                    variable_name=match.group(index),
+                    value="",  # No value in reference
+                    source_type='file',
+                    is_example=False,
+                    is_sensitive=False
+                )
+                found[index - 1].append(definition)
+            
+            for group in found:
+                definitions.extend(group)
         
         except Exception as e:
-            print(f"⚠️ Error parsing YAML {file_path}: {e}")
+            _log.warning("⚠️ Error parsing YAML %s: %s", file_path, e)
         
         return definitions
     
     def _get_system_definitions(self) -> List[EnvDefinition]:
         """Get system environment variable definitions"""
-        definitions = []
-        
-        for var_name, var_value in self.system_vars.items():
-            is_sensitive = any(pattern in var_name.lower() for pattern in self.SENSITIVE_PATTERNS)
-            
-            definition = EnvDefinition(
+        # Built from the snapshot taken in __init__: os.environ decodes every key and value on access
+        find_sensitive = self._SENSITIVE_RE.search
+        definitions = [
+            EnvDefinition(
                 file_path="<system>",
                 line_number=0,
                 variable_name=var_name,
                 value=var_value,
                 source_type='system',
                 is_example=False,
-                is_sensitive=is_sensitive
+                is_sensitive=find_sensitive(var_name.lower()) is not None
             )
-            definitions.append(definition)
+            for var_name, var_value in self.system_vars.items()
+        ]
         
-        print(f"🖥️ Found {len(definitions)} system environment variables")
+        _log.info("🖥️ Found %d system environment variables", len(definitions))
         return definitions
     
     def _calculate_usage_stats(self, usages: List[EnvUsage], definitions: List[EnvDefinition]) -> Dict[str, Any]:
         """Calculate comprehensive usage statistics"""
-        used_vars = set(usage.variable_name for usage in usages)
-        defined_vars = set(defn.variable_name for defn in definitions)
-        system_vars = set(defn.variable_name for defn in definitions if defn.source_type == 'system')
-        file_vars = set(defn.variable_name for defn in definitions if defn.source_type == 'file')
+        used_vars = set()
+        usage_files = set()
+        for usage in usages:
+            used_vars.add(usage.variable_name)
+            usage_files.add(usage.file_path)
+        
+        defined_vars = set()
+        system_vars = set()
+        file_vars = set()
+        config_files = set()
+        for defn in definitions:
+            defined_vars.add(defn.variable_name)
+            if defn.source_type == 'system':
+                system_vars.add(defn.variable_name)
+            elif defn.source_type == 'file':
+                file_vars.add(defn.variable_name)
+                config_files.add(defn.file_path)
         
         return {
             'total_usages': len(usages),
@@ -513,8 +759,8 @@ class EnhancedEnvScanner:
             'perfect_matches': len(used_vars & defined_vars),
             'missing_definitions': len(used_vars - defined_vars),
             'unused_definitions': len(defined_vars - used_vars),
-            'files_with_usage': len(set(usage.file_path for usage in usages)),
-            'config_files_found': len(set(defn.file_path for defn in definitions if defn.source_type == 'file')),
+            'files_with_usage': len(usage_files),
+            'config_files_found': len(config_files),
         }
     
     def _build_file_variables_mapping(self, definitions: List[EnvDefinition]) -> Dict[str, Dict[str, str]]:
@@ -534,12 +780,34 @@ class EnhancedEnvScanner:
 class EnhancedEnvVariableVisitor(ast.NodeVisitor):
     """Enhanced AST visitor for finding environment variable usage"""
     
-    def __init__(self, file_path: str, lines: List[str]):
+    def __init__(self, file_path: str, content: str):
         self.file_path = file_path
-        self.lines = lines
+        self.content = content
+        self._newlines: Optional[List[int]] = None  # built on the first usage found
         self.usages: List[EnvUsage] = []
         self.current_function = None
         self.current_class = None
+        self._handlers: Dict[type, Callable] = {}
+    
+    def visit(self, node: ast.AST):
+        """Dispatch to the visit_ method for the node type, looked up once per type"""
+        node_type = type(node)
+        handler = self._handlers.get(node_type)
+        if handler is None:
+            handler = self._handlers[node_type] = getattr(self, 'visit_' + node_type.__name__, self.generic_visit)
+        return handler(node)
+    
+    def generic_visit(self, node: ast.AST):
+        """Visit child nodes, like ast.NodeVisitor.generic_visit without the iter_fields generator"""
+        visit = self.visit
+        for field in node._fields:
+            value = getattr(node, field, None)
+            if isinstance(value, list):
+                for item in value:
+                    if isinstance(item, ast.AST):
+                        visit(item)
+            elif isinstance(value, ast.AST):
+                visit(value)
     
     def visit_FunctionDef(self, node: ast.FunctionDef):
         """Track current function context"""
@@ -557,49 +825,27 @@ class EnhancedEnvVariableVisitor(ast.NodeVisitor):
     
     def visit_Call(self, node: ast.Call):
         """Visit function calls to detect env var access"""
-        
-        # Handle os.getenv(), os.environ.get(), etc.
-        if isinstance(node.func, ast.Attribute):
-            if isinstance(node.func.value, ast.Attribute):
-                # os.environ.get()
-                if (isinstance(node.func.value.value, ast.Name) and
-                    node.func.value.value.id == 'os' and
-                    node.func.value.attr == 'environ' and
-                    node.func.attr == 'get'):
-                    self._extract_env_usage(node, 'os.environ.get')
-            elif isinstance(node.func.value, ast.Name):
-                # os.getenv()
-                if (node.func.value.id == 'os' and 
-                    node.func.attr == 'getenv'):
-                    self._extract_env_usage(node, 'os.getenv')
-                # environ.get() (if imported directly)
-                elif (node.func.value.id == 'environ' and 
-                      node.func.attr == 'get'):
-                    self._extract_env_usage(node, 'environ.get')
-        
-        # Handle direct function calls
-        elif isinstance(node.func, ast.Name):
-            if node.func.id in ['getenv', 'get_env', 'env_var', 'get_setting', 'get_config']:
-                self._extract_env_usage(node, node.func.id)
+        # os.getenv(), os.environ.get(), get_env(), etc.
+        method = _ENV_CALLS.get(_dotted_name(node.func))
+        if method is not None:
+            self._extract_env_usage(node, method)
         
         self.generic_visit(node)
     
     def visit_Subscript(self, node: ast.Subscript):
         """Visit subscript access like os.environ['KEY']"""
-        
-        if isinstance(node.value, ast.Attribute):
-            # os.environ['KEY']
-            if (isinstance(node.value.value, ast.Name) and
-                node.value.value.id == 'os' and
-                node.value.attr == 'environ'):
-                self._extract_env_usage_subscript(node, 'os.environ[]')
-        elif isinstance(node.value, ast.Name):
-            # environ['KEY'] (if imported directly)  
-            if node.value.id == 'environ':
-                self._extract_env_usage_subscript(node, 'environ[]')
+        method = _ENV_SUBSCRIPTS.get(_dotted_name(node.value))
+        if method is not None:
+            self._extract_env_usage_subscript(node, method)
         
         self.generic_visit(node)
     
+    def _context_line(self, line_num: int) -> str:
+        """Source line for a usage"""
+        if self._newlines is None:
+            self._newlines = _newline_offsets(self.content)
+        return _line_at(self.content, self._newlines, line_num)
+    
     def _extract_env_usage(self, node: ast.Call, method: str):
         """Extract environment variable name from function call"""
         if node.args and isinstance(node.args[0], ast.Constant):
@@ -615,11 +861,11 @@ class EnhancedEnvVariableVisitor(ast.NodeVisitor):
                     file_path=self.file_path,
                     line_number=node.lineno,
                     column=node.col_offset,
-                    variable_name=var_name,
+                    variable_name=sys.intern(var_name),
                     access_method=method,
                     has_default=has_default,
                     default_value=default_value,
-                    context_line=self.lines[node.lineno - 1] if node.lineno <= len(self.lines) else "",
+                    context_line=self._context_line(node.lineno),
                     function_name=self.current_function,
                     class_name=self.current_class
                 )
@@ -634,26 +880,61 @@ class EnhancedEnvVariableVisitor(ast.NodeVisitor):
                 file_path=self.file_path,
                 line_number=node.lineno,
                 column=node.col_offset,
-                variable_name=var_name,
+                variable_name=sys.intern(var_name),
                 access_method=method,
                 has_default=False,
                 default_value=None,
-                context_line=self.lines[node.lineno - 1] if node.lineno <= len(self.lines) else "",
+                context_line=self._context_line(node.lineno),
                 function_name=self.current_function,
                 class_name=self.current_class
             )
             self.usages.append(usage)
 
 
+class _RecordCollector(logging.Handler):
+    """Keeps a worker's log records so the parent process can replay them in file order"""
+    
+    def __init__(self):
+        super().__init__()
+        self.records: List[logging.LogRecord] = []
+    
+    def emit(self, record: logging.LogRecord):
+        # Format now: arguments such as exceptions may not survive pickling back to the parent
+        record.msg, record.args = record.getMessage(), None
+        self.records.append(record)
+
+
+_worker_scanner: Optional[EnhancedEnvScanner] = None
+_worker_records: Optional[_RecordCollector] = None
+
+def _init_scan_worker(scanner_class: type, project_root: str):
+    """Create the scanner used by a worker process, collecting its log records instead of emitting them"""
+    global _worker_scanner, _worker_records
+    _worker_scanner = scanner_class(project_root)
+    _worker_records = _RecordCollector()
+    _log.addHandler(_worker_records)
+    _log.propagate = False
+    _log.setLevel(logging.DEBUG)  # the parent applies its own level when replaying
+
+def _scan_file_in_worker(file_path: Path) -> Tuple[List[EnvUsage], List[logging.LogRecord], Optional[str]]:
+    """Scan one file in a worker, returning its usages, log records and error message"""
+    _worker_records.records = []
+    usages, error = [], None
+    try:
+        usages = _worker_scanner._scan_single_file(file_path)
+    except Exception as e:
+        error = str(e)
+    return usages, _worker_records.records, error
+
+
 if __name__ == "__main__":
     # Test the enhanced scanner
-    import sys
-    
     if len(sys.argv) > 1:
         project_path = sys.argv[1]
     else:
         project_path = "."
     
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
     scanner = EnhancedEnvScanner(project_path)
     result = scanner.scan_everything()
     
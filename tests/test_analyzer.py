@@ -4,7 +4,6 @@ Tests environment variable analysis and mismatch detection
 """
 
 import pytest
-import tempfile
 import os
 from pathlib import Path
 from envdoc.analyzer import EnhancedEnvAnalyzer
@@ -12,15 +11,11 @@ from envdoc.analyzer import EnhancedEnvAnalyzer
 
 class TestEnvAnalyzer:
     
-    def setup_method(self):
-        """Set up test fixtures before each test method"""
+    @pytest.fixture(autouse=True)
+    def setup_fixtures(self, tmp_path):
+        """Set up test fixtures before each test method (pytest cleans up tmp_path)"""
         self.analyzer = EnhancedEnvAnalyzer()
-        self.test_dir = tempfile.mkdtemp()
-        
-    def teardown_method(self):
-        """Clean up after each test method"""
-        import shutil
-        shutil.rmtree(self.test_dir, ignore_errors=True)
+        self.test_dir = str(tmp_path)
     
     def create_env_file(self, filename: str, content: str) -> str:
         """Helper method to create .env files"""
@@ -4,8 +4,6 @@ Tests command line interface functionality
 """
 
 import pytest
-import tempfile
-import os
 from pathlib import Path
 from click.testing import CliRunner
 from envdoc.cli import main, health, analyze, setup
@@ -13,15 +11,13 @@ from envdoc.cli import main, health, analyze, setup
 
 class TestCLI:
     
-    def setup_method(self):
-        """Set up test fixtures before each test method"""
+    @pytest.fixture(autouse=True)
+    def setup_fixtures(self, tmp_path, monkeypatch):
+        """Set up test fixtures before each test method (pytest cleans up tmp_path)"""
         self.runner = CliRunner()
-        self.test_dir = tempfile.mkdtemp()
-        
-    def teardown_method(self):
-        """Clean up after each test method"""
-        import shutil
-        shutil.rmtree(self.test_dir, ignore_errors=True)
+        self.test_dir = str(tmp_path)
+        # Commands run from the project directory; monkeypatch restores the cwd afterwards
+        monkeypatch.chdir(tmp_path)
     
     def create_test_project(self):
         """Create a test project structure"""
@@ -61,52 +57,44 @@ UNUSED_VAR=unused_value
     
     def test_health_command_basic(self):
         """Test basic health command"""
-        project_dir = self.create_test_project()
+        self.create_test_project()
         
-        with self.runner.isolated_filesystem():
-            os.chdir(project_dir)
-            result = self.runner.invoke(health)
-            
-            assert result.exit_code == 0
-            # Should contain health score information
-            assert 'Health Score' in result.output or 'score' in result.output.lower()
+        result = self.runner.invoke(health)
+        
+        assert result.exit_code == 0
+        # Should contain health score information
+        assert 'Health Score' in result.output or 'score' in result.output.lower()
     
     def test_health_command_score_only(self):
         """Test health command with --score-only flag"""
-        project_dir = self.create_test_project()
+        self.create_test_project()
         
-        with self.runner.isolated_filesystem():
-            os.chdir(project_dir)
-            result = self.runner.invoke(health, ['--score-only'])
-            
-            assert result.exit_code == 0
-            # Should output only numeric score
-            output_lines = [line.strip() for line in result.output.split('\n') if line.strip()]
-            assert len(output_lines) >= 1
+        result = self.runner.invoke(health, ['--score-only'])
+        
+        assert result.exit_code == 0
+        # Should output only numeric score
+        output_lines = [line.strip() for line in result.output.split('\n') if line.strip()]
+        assert len(output_lines) >= 1
     
     def test_analyze_command_basic(self):
         """Test basic analyze command"""
-        project_dir = self.create_test_project()
+        self.create_test_project()
         
-        with self.runner.isolated_filesystem():
-            os.chdir(project_dir)
-            result = self.runner.invoke(analyze)
-            
-            assert result.exit_code == 0
-            # Should show analysis results
-            assert 'Environment Variables' in result.output or 'Found' in result.output
+        result = self.runner.invoke(analyze)
+        
+        assert result.exit_code == 0
+        # Should show analysis results
+        assert 'Environment Variables' in result.output or 'Found' in result.output
     
     def test_analyze_command_detailed(self):
         """Test analyze command with --detailed flag"""
-        project_dir = self.create_test_project()
+        self.create_test_project()
         
-        with self.runner.isolated_filesystem():
-            os.chdir(project_dir)
-            result = self.runner.invoke(analyze, ['--detailed'])
-            
-            assert result.exit_code == 0
-            # Detailed output should be longer
-            assert len(result.output) > 100
+        result = self.runner.invoke(analyze, ['--detailed'])
+        
+        assert result.exit_code == 0
+        # Detailed output should be longer
+        assert len(result.output) > 100
     
     def test_setup_command_with_example(self):
         """Test setup command when .env.example exists"""
@@ -120,44 +108,38 @@ API_KEY=your_api_key_here
 DEBUG=false
         ''')
         
-        with self.runner.isolated_filesystem():
-            os.chdir(project_dir)
-            result = self.runner.invoke(setup)
-            
-            assert result.exit_code == 0
-            
-            # Check that .env file was created
-            env_file = project_dir / '.env'
-            assert env_file.exists()
-            
-            # Verify content
-            env_content = env_file.read_text()
-            assert 'DATABASE_URL' in env_content
-            assert 'API_KEY' in env_content
-            assert 'DEBUG' in env_content
+        result = self.runner.invoke(setup)
+        
+        assert result.exit_code == 0
+        
+        # Check that .env file was created
+        env_file = project_dir / '.env'
+        assert env_file.exists()
+        
+        # Verify content
+        env_content = env_file.read_text()
+        assert 'DATABASE_URL' in env_content
+        assert 'API_KEY' in env_content
+        assert 'DEBUG' in env_content
     
     def test_setup_command_no_example(self):
         """Test setup command when no .env.example exists"""
         project_dir = Path(self.test_dir)
         
-        with self.runner.isolated_filesystem():
-            os.chdir(project_dir)
-            result = self.runner.invoke(setup)
-            
-            # Should handle gracefully (might create basic .env or show message)
-            assert result.exit_code in [0, 1]  # Allow for different handling strategies
+        result = self.runner.invoke(setup)
+        
+        # Should handle gracefully (might create basic .env or show message)
+        assert result.exit_code in [0, 1]  # Allow for different handling strategies
     
     def test_verbose_flag(self):
         """Test --verbose flag"""
-        project_dir = self.create_test_project()
+        self.create_test_project()
         
-        with self.runner.isolated_filesystem():
-            os.chdir(project_dir)
-            result = self.runner.invoke(main, ['--verbose', 'health'])
-            
-            assert result.exit_code == 0
-            # Verbose output should contain more details
-            assert len(result.output) > 50
+        result = self.runner.invoke(main, ['--verbose', 'health'])
+        
+        assert result.exit_code == 0
+        # Verbose output should contain more details
+        assert len(result.output) > 50
     
     def test_project_root_flag(self):
         """Test --project-root flag"""
@@ -170,15 +152,13 @@ DEBUG=false
     
     def test_dry_run_flag(self):
         """Test --dry-run flag"""
-        project_dir = self.create_test_project()
+        self.create_test_project()
         
-        with self.runner.isolated_filesystem():
-            os.chdir(project_dir)
-            result = self.runner.invoke(main, ['--dry-run', 'analyze'])
-            
-            assert result.exit_code == 0
-            # Should indicate dry-run mode
-            assert 'dry' in result.output.lower() or 'simulation' in result.output.lower()
+        result = self.runner.invoke(main, ['--dry-run', 'analyze'])
+        
+        assert result.exit_code == 0
+        # Should indicate dry-run mode
+        assert 'dry' in result.output.lower() or 'simulation' in result.output.lower()
     
     def test_invalid_command(self):
         """Test invalid command handling"""
@@ -189,34 +169,29 @@ DEBUG=false
     
     def test_empty_project(self):
         """Test commands on empty project directory"""
-        with self.runner.isolated_filesystem():
-            result = self.runner.invoke(health)
-            
-            # Should handle empty project gracefully
-            assert result.exit_code in [0, 1]
+        result = self.runner.invoke(health)
+        
+        # Should handle empty project gracefully
+        assert result.exit_code in [0, 1]
     
     def test_json_output_format(self):
         """Test JSON output format if supported"""
-        project_dir = self.create_test_project()
+        self.create_test_project()
         
-        with self.runner.isolated_filesystem():
-            os.chdir(project_dir)
-            # Try JSON format if the CLI supports it
-            result = self.runner.invoke(analyze, ['--format', 'json'])
-            
-            # May not be implemented yet, so allow for different responses
-            assert result.exit_code in [0, 2]  # Success or "no such option"
+        # Try JSON format if the CLI supports it
+        result = self.runner.invoke(analyze, ['--format', 'json'])
+        
+        # May not be implemented yet, so allow for different responses
+        assert result.exit_code in [0, 2]  # Success or "no such option"
     
     def test_color_output_control(self):
         """Test color output control"""
-        project_dir = self.create_test_project()
+        self.create_test_project()
         
-        with self.runner.isolated_filesystem():
-            os.chdir(project_dir)
-            result = self.runner.invoke(main, ['--no-color', 'health'])
-            
-            # Should work with or without color support
-            assert result.exit_code in [0, 2]
+        result = self.runner.invoke(main, ['--no-color', 'health'])
+        
+        # Should work with or without color support
+        assert result.exit_code in [0, 2]
 
 
 class TestCLIIntegration:
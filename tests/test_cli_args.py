@@ -0,0 +1,144 @@
+"""
+Unit tests for EnvDoc CLI argument parsing
+Tests that the argparse-free fast path parses exactly as argparse does,
+and that the cached --help rendering follows changes to the CLI module
+"""
+
+import argparse
+import os
+import pytest
+import envdoc.cli
+from envdoc.cli import EnvDoctorCLI, _help_cache_file
+
+
+COMMANDS = [name for name, _ in EnvDoctorCLI.SUBCOMMANDS]
+
+# Command lines the fast path must hand over to argparse
+FALLBACK_ARGVS = [
+    [],
+    ['--verbose', 'scan'],
+    ['-p', '.', 'health'],
+    ['scan', '--help'],
+    ['scan', 'extra'],
+    ['scan', '--unknown'],
+    ['scan', '-f'],
+    ['scan', '--output-format', 'xml'],
+    ['scan', '--output-format=json'],
+    ['analyze', '--det'],
+    ['analyze', '--report'],
+    ['fix', '--confidence', 'high'],
+    ['fix', '-c', '-0.5'],
+    ['fix', '-bc', '0.5'],
+]
+
+
+@pytest.fixture
+def cli():
+    """A fresh CLI instance, whose parsers are built on first use"""
+    return EnvDoctorCLI()
+
+
+def subcommand_parser(cli: EnvDoctorCLI, command: str) -> argparse.ArgumentParser:
+    """The argparse subparser holding command's options"""
+    parser = cli.create_parser([command])
+    subparsers = next(a for a in parser._actions if isinstance(a, argparse._SubParsersAction))
+    return subparsers.choices[command]
+
+
+def option_argvs(cli: EnvDoctorCLI, command: str):
+    """Command lines giving each option of command, through every spelling, with valid values"""
+    for action in subcommand_parser(cli, command)._actions:
+        if isinstance(action, argparse._HelpAction):
+            continue
+        if action.nargs == 0:
+            values = [[]]
+        elif action.choices:
+            values = [[choice] for choice in action.choices]
+        elif action.type is float:
+            values = [['0.5'], ['1']]
+        else:
+            values = [['results.txt']]
+        for option in action.option_strings:
+            for value in values:
+                yield [command, option, *value]
+
+
+class TestFastParse:
+    
+    def assert_matches_argparse(self, cli: EnvDoctorCLI, argv):
+        """Assert the fast path gives argparse's namespace for argv"""
+        fast = cli._fast_parse(argv)
+        assert fast is not None, argv
+        assert vars(fast) == vars(cli.create_parser(argv).parse_args(argv)), argv
+    
+    @pytest.mark.parametrize("command", COMMANDS)
+    def test_defaults_match_argparse(self, cli, command):
+        """Test a bare subcommand gets argparse's defaults"""
+        self.assert_matches_argparse(cli, [command])
+    
+    @pytest.mark.parametrize("command", COMMANDS)
+    def test_options_match_argparse(self, cli, command):
+        """Test every short and long option of a subcommand parses as argparse does"""
+        argvs = list(option_argvs(cli, command))
+        assert argvs
+        for argv in argvs:
+            self.assert_matches_argparse(cli, argv)
+    
+    @pytest.mark.parametrize("command", COMMANDS)
+    def test_combined_options_match_argparse(self, cli, command):
+        """Test all options of a subcommand given together, and twice, parse as argparse does"""
+        argv = [command]
+        for option_argv in option_argvs(cli, command):
+            argv.extend(option_argv[1:])
+        self.assert_matches_argparse(cli, argv)
+        self.assert_matches_argparse(cli, argv + argv[1:])
+    
+    @pytest.mark.parametrize("command", COMMANDS)
+    def test_fast_options_exist_in_argparse(self, cli, command):
+        """Test the fast path knows no option that argparse does not define"""
+        option_strings = {
+            option
+            for action in subcommand_parser(cli, command)._actions
+            for option in action.option_strings
+        }
+        assert set(EnvDoctorCLI.FAST_OPTIONS[command]) <= option_strings
+    
+    @pytest.mark.parametrize("argv", FALLBACK_ARGVS)
+    def test_falls_back_to_argparse(self, cli, argv):
+        """Test command lines outside the fast path's grammar are left to argparse"""
+        assert cli._fast_parse(argv) is None
+
+
+class TestHelpCache:
+    
+    @pytest.fixture
+    def cli_module_copy(self, tmp_path, monkeypatch):
+        """A copy of the CLI module standing in for it, with the help cache under tmp_path"""
+        module_copy = tmp_path / 'cli.py'
+        module_copy.write_bytes(open(envdoc.cli.__file__, 'rb').read())
+        monkeypatch.setattr(envdoc.cli, '__file__', str(module_copy))
+        monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path / 'cache'))
+        return module_copy
+    
+    def test_cache_file_follows_module_changes(self, cli_module_copy):
+        """Test editing the CLI module moves the help cache to a new file"""
+        before = _help_cache_file()
+        stat = cli_module_copy.stat()
+        os.utime(cli_module_copy, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        
+        assert _help_cache_file() != before
+        assert _help_cache_file().parent == before.parent
+    
+    def test_stale_help_is_not_served(self, cli_module_copy, capsys):
+        """Test help cached before the CLI module changed is rendered afresh"""
+        assert EnvDoctorCLI()._print_cached_help() == 0
+        fresh = capsys.readouterr().out
+        stale_file = _help_cache_file()
+        assert stale_file.read_text(encoding='utf-8') == fresh
+        
+        stale_file.write_text("stale help\n", encoding='utf-8')
+        with open(cli_module_copy, 'a', encoding='utf-8') as f:
+            f.write("\n")
+        
+        assert EnvDoctorCLI()._print_cached_help() == 0
+        assert capsys.readouterr().out == fresh
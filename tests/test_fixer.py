@@ -0,0 +1,112 @@
+"""
+Unit tests for EnvDoc Fixer module
+Tests variable renaming in code and updates to .env files
+"""
+
+import os
+import pytest
+from envdoc.analyzer import EnhancedMismatch
+from envdoc.fixer import EnhancedEnvFixer, FixAction
+
+
+RENAMES = {'DB_HOST': 'DATABASE_HOST', 'API_KEY': 'SERVICE_API_KEY', 'OLD': 'NEW'}
+
+RENAME_SOURCES = [
+    "import os\nhost = os.getenv('DB_HOST')\n",
+    'import os\nhost = os.getenv("DB_HOST", "localhost")\n',
+    "import os\nhost = os.environ['DB_HOST']\nkey = os.environ.get('API_KEY')\n",
+    "from os import getenv, environ\nhost = getenv('DB_HOST')  # DB_HOST comment\nkey = environ [ 'API_KEY' ]\n",
+    "import os\nurl = f\"http://{os.getenv('DB_HOST')}/\"\n",
+    "import os\nurl = f'{os.environ[\"API_KEY\"]}' + os.getenv('DB_HOST')\n",
+    # Accessor look-alikes in f-string literal text are not code
+    "x = f\"use os.getenv('OLD') here\"\n",
+    "x = f\"{os.getenv('OLD')} os.environ['OLD']\"\n",
+    "x = f\"{{os.getenv('OLD')}} {os.environ['OLD']!r:>{width}}\"\n",
+    "x = f'''\\N{DASH} {os.getenv(\"OLD\")}'''\n",
+    "import os\n# os.getenv('DB_HOST') in a comment\nname = 'DB_HOST'\nother = settings.get('DB_HOST')\n",
+    "import os\nhost = x.getenv('DB_HOST')\nmissing = os.getenv('DB_HOSTNAME')\n",
+    "def f(\n    a,\n):\n    return os.getenv(\n        'API_KEY',\n    )\n",
+]
+
+
+@pytest.fixture
+def rename_fixer():
+    """A dry-run fixer for the rename methods, which work on strings and touch no project files"""
+    return EnhancedEnvFixer(os.curdir, dry_run=True)
+
+
+@pytest.fixture
+def env_fixer(tmp_path):
+    """A fixer for a project in tmp_path, writing its .env there"""
+    return EnhancedEnvFixer(str(tmp_path))
+
+
+def add_to_env_action(name: str, value: str) -> FixAction:
+    """An add_to_env action setting name to value"""
+    mismatch = EnhancedMismatch(
+        used_name=name, usages=[], suggested_matches=[], confidence_scores=[],
+        issue_type='missing', system_available=False, file_available=[],
+        recommended_action='add_to_env'
+    )
+    return FixAction(
+        mismatch=mismatch, action_type='add_to_env', old_name=name, new_name=name,
+        target_files=[], env_files_to_update=['.env'], value_to_set=value
+    )
+
+
+class TestRename:
+    
+    @pytest.mark.parametrize("content", RENAME_SOURCES)
+    def test_tokenize_matches_libcst(self, rename_fixer, content):
+        """Test the tokenize fallback renames exactly what the libcst path renames"""
+        pytest.importorskip('libcst')
+        
+        cst_renamed, token_renamed = {}, {}
+        cst_result = rename_fixer._rename_with_cst(content, RENAMES, cst_renamed)
+        token_result = rename_fixer._rename_with_tokenize(content, RENAMES, token_renamed)
+        
+        assert cst_result is not None
+        assert token_result == cst_result
+        assert token_renamed == cst_renamed
+    
+    def test_rename_keeps_comments(self, rename_fixer):
+        """Test comments and plain strings are left alone by the tokenize path"""
+        content = "import os\nhost = os.getenv('DB_HOST')  # DB_HOST\nname = 'DB_HOST'\n"
+        
+        result = rename_fixer._rename_with_tokenize(content, RENAMES)
+        
+        assert result == "import os\nhost = os.getenv('DATABASE_HOST')  # DB_HOST\nname = 'DB_HOST'\n"
+
+
+class TestEnvFileUpdate:
+    
+    @pytest.mark.parametrize("ending", [b"\n", b"\r\n"])
+    def test_update_existing_key_in_place(self, env_fixer, tmp_path, ending):
+        """Test updating a defined key rewrites only its line"""
+        lines = [
+            b"# Database settings",
+            b"DB_HOST=localhost",
+            b"",
+            b"API_KEY='quoted # value'",
+            b"  PORT = 5432",
+            b"DEBUG=true # inline",
+        ]
+        env_path = tmp_path / '.env'
+        env_path.write_bytes(ending.join(lines) + ending)
+        
+        assert env_fixer._append_to_env_file([add_to_env_action('PORT', '6543')]) is True
+        
+        expected = lines[:4] + [b"PORT=6543"] + lines[5:]
+        assert env_path.read_bytes() == ending.join(expected) + ending
+    
+    def test_append_new_key_keeps_existing_lines(self, env_fixer, tmp_path):
+        """Test a key not yet defined is appended after the untouched contents"""
+        original = b"A=1\r\n# comment\r\nB=2"
+        env_path = tmp_path / '.env'
+        env_path.write_bytes(original)
+        
+        assert env_fixer._append_to_env_file([add_to_env_action('C', '3')]) is True
+        
+        content = env_path.read_bytes()
+        assert content.startswith(original)
+        assert content[len(original):].split() == [b"#", b"Added", b"by", b"EnvDoctor", b"C=3"]
@@ -4,23 +4,19 @@ Tests environment variable detection in code files
 """
 
 import pytest
-import tempfile
 import os
 from pathlib import Path
+import envdoc.scanner
 from envdoc.scanner import EnhancedEnvScanner
 
 
 class TestEnvScanner:
     
-    def setup_method(self):
-        """Set up test fixtures before each test method"""
+    @pytest.fixture(autouse=True)
+    def setup_fixtures(self, tmp_path):
+        """Set up test fixtures before each test method (pytest cleans up tmp_path)"""
         self.scanner = EnhancedEnvScanner()
-        self.test_dir = tempfile.mkdtemp()
-        
-    def teardown_method(self):
-        """Clean up after each test method"""
-        import shutil
-        shutil.rmtree(self.test_dir, ignore_errors=True)
+        self.test_dir = str(tmp_path)
     
     def create_test_file(self, filename: str, content: str) -> str:
         """Helper method to create test files"""
@@ -180,5 +176,87 @@ real_var = os.getenv('REAL_VAR')
         assert results == []
 
 
+COMPOSE_FILE = """\
+services:
+  web:
+    image: app
+    environment:
+      DATABASE_URL: postgres://db/app
+      DEBUG: "true"
+      EMPTY:
+  worker:
+    environment:
+      - QUEUE_URL=redis://cache:6379/0
+      - API_TOKEN=a=b
+      - PASSTHROUGH
+  db:
+    image: postgres
+"""
+
+
+class TestDockerCompose:
+    
+    @pytest.fixture
+    def compose_file(self, tmp_path):
+        """A docker-compose.yml in tmp_path using both environment forms"""
+        file_path = tmp_path / 'docker-compose.yml'
+        file_path.write_text(COMPOSE_FILE, encoding='utf-8')
+        return file_path
+    
+    @pytest.fixture
+    def scanner(self, tmp_path):
+        """A scanner rooted at tmp_path"""
+        return EnhancedEnvScanner(str(tmp_path))
+    
+    def definitions_by_name(self, scanner, compose_file):
+        """Definitions parsed from compose_file, keyed by variable name"""
+        pytest.importorskip('yaml')
+        definitions = scanner._parse_config_file(compose_file)
+        assert len({d.variable_name for d in definitions}) == len(definitions)
+        return {d.variable_name: d for d in definitions}
+    
+    def test_mapping_environment(self, scanner, compose_file):
+        """Test the KEY: value mapping form of environment"""
+        definitions = self.definitions_by_name(scanner, compose_file)
+        
+        assert definitions['DATABASE_URL'].value == 'postgres://db/app'
+        assert definitions['DEBUG'].value == 'true'
+        assert definitions['EMPTY'].value == ''
+        assert definitions['DATABASE_URL'].file_path == str(compose_file)
+        assert definitions['DATABASE_URL'].source_type == 'file'
+    
+    def test_list_environment(self, scanner, compose_file):
+        """Test the list form of environment, with KEY=value and bare KEY items"""
+        definitions = self.definitions_by_name(scanner, compose_file)
+        
+        assert definitions['QUEUE_URL'].value == 'redis://cache:6379/0'
+        assert definitions['API_TOKEN'].value == 'a=b'
+        assert definitions['API_TOKEN'].is_sensitive
+        assert definitions['PASSTHROUGH'].value == ''
+        assert set(definitions) == {'DATABASE_URL', 'DEBUG', 'EMPTY', 'QUEUE_URL', 'API_TOKEN', 'PASSTHROUGH'}
+    
+    def test_line_numbers(self, scanner, compose_file):
+        """Test line numbers come from each entry's position in the file"""
+        definitions = self.definitions_by_name(scanner, compose_file)
+        
+        lines = COMPOSE_FILE.splitlines()
+        for name, definition in definitions.items():
+            assert name in lines[definition.line_number - 1]
+    
+    def test_without_pyyaml(self, scanner, compose_file, monkeypatch):
+        """Test compose files yield no definitions when PyYAML is not installed"""
+        monkeypatch.setattr(envdoc.scanner, 'YAML_AVAILABLE', False)
+        
+        assert scanner._parse_config_file(compose_file) == []
+    
+    def test_invalid_yaml(self, scanner, tmp_path):
+        """Test a compose file that does not parse yields no definitions"""
+        pytest.importorskip('yaml')
+        file_path = tmp_path / 'docker-compose.yml'
+        file_path.write_text("services: [unclosed\n", encoding='utf-8')
+        
+        assert scanner._parse_config_file(file_path) == []
+
+
 if __name__ == '__main__':
     pytest.main([__file__])